@@ -0,0 +1,175 @@
+import argparse
+import glob
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+timeUnits = {'fs': 1e-6, 'ps': 1e-3, 'ns': 1, 'µs': 1e3, 'us': 1e3, 'mus': 1e3, 'ms': 1e6, 's': 1e9}
+re_range = re.compile(r'^\s*(-?[0-9.]+)\s*([a-zA-Zµ]*)\s*-\s*(-?[0-9.]+)\s*([a-zA-Zµ]*)\s*$')
+
+
+def parseArgs(argv):
+    from mplcanvas import plotModes
+    from tracedata import timeModes
+    parser = argparse.ArgumentParser(prog='main.py --batch',
+                                     description='Render Touchstone files to figures/CSV without the GUI.')
+    parser.add_argument('--batch', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', default='db', choices=list(plotModes.values()),
+                        help='plot mode, see the plot selector box (default: db)')
+    parser.add_argument('--range', default=None,
+                        help="x range, e.g. '7-9GHz' for frequency or '0-5ns' for time modes")
+    parser.add_argument('--params', nargs='+', default=None, metavar='Smn',
+                        help='S-parameters to plot, e.g. S11 S21 (default: all)')
+    parser.add_argument('--format', nargs='+', default=['tex'], choices=['tex', 'png', 'pdf', 'svg', 'csv'],
+                        help='output formats (default: tex)')
+    parser.add_argument('--tolerance', type=float, default=None, metavar='PT',
+                        help='tikz point reduction, allowed curve deviation in pt (default: 0.25, 0 keeps all)')
+    parser.add_argument('--external-data', action='store_true', help='write tikz data to .dat tables')
+    parser.add_argument('--out', default='.', help='output directory')
+    parser.add_argument('--dpi', type=int, default=120)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+    if args.mode in timeModes and 'csv' in args.format:  # same as the export queue, data export is per frequency
+        print("CSV is not available for time mode '{}', skipped".format(args.mode), file=sys.stderr)
+        args.format = [fmt for fmt in args.format if fmt != 'csv']
+        if not args.format:
+            parser.error("no output format left for mode '{}'".format(args.mode))
+
+    files = []
+    for pattern in args.files:  # the Windows shell doesn't expand wildcards
+        files.extend(sorted(glob.glob(pattern)) or [pattern])
+    args.files = files
+    return args
+
+
+def parseRange(text: str, mode: str):
+    match = re_range.match(text)
+    if match is None:
+        raise ValueError("Invalid range '{}'".format(text))
+    start, start_unit, stop, stop_unit = match.groups()
+    unit = (stop_unit or start_unit).lower()
+    if mode in ('s_time', 'z_time'):
+        multiplier = timeUnits[unit or 'ns']  # axis is in ns
+    else:
+        from skrf.frequency import Frequency
+        multiplier = Frequency.multiplier_dict[unit or 'ghz']  # window is in Hz
+    start, stop = sorted((float(start) * multiplier, float(stop) * multiplier))
+    return start, stop
+
+
+def parseParams(params, nports):
+    if params is None:
+        return None
+    tuples = []
+    for p in params:
+        match = re.match(r'^[sS]?(\d)(\d)$', p)
+        if match is None:
+            raise ValueError("Invalid parameter '{}'".format(p))
+        m, n = int(match.group(1)) - 1, int(match.group(2)) - 1
+        if m < nports and n < nports:
+            tuples.append((m, n))
+    return tuples
+
+
+def setupAxes(ax, mode: str, linewidth: float = 1.5):
+    # same look as MplCanvas with both grids enabled
+    if mode == 'smith':
+        from skrf.plotting import smith
+        smith(ax=ax, draw_labels=True, draw_vswr=True)
+    else:
+        ax.grid(visible=True, which='major')
+        ax.grid(visible=True, which='minor', linestyle='--', linewidth=0.25 * linewidth)
+        ax.minorticks_on()
+
+
+def rangeFits(text: str, mode: str) -> bool:
+    # '7-9GHz' only applies to frequency modes, '0-5ns' only to time modes, bare numbers to both
+    try:
+        parseRange(text, mode)
+    except (ValueError, KeyError):
+        return False
+    return True
+
+
+def rangeTag(text: str) -> str:
+    return re.sub(r'[^0-9a-zA-Z.\-]+', '', text.replace('µ', 'u'))
+
+
+def renderNetwork(nwItem, mode: str, rangeText: str, params, formats: list[str], out: str, dpi: int = 120,
+                  tag: str = '', tolerance: float = None, external: bool = False) -> list[str]:
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from export import writeTikz, writeCSV
+    from tracedata import plotTrace, timeModes
+
+    network = nwItem.network()
+    params = parseParams(params, network.nports)
+    if params is None:
+        params = [p.toTuple() for p in nwItem.params()]
+
+    window = None
+    xlim = None
+    if rangeText:
+        start, stop = parseRange(rangeText, mode)
+        if mode in timeModes:
+            xlim = (start, stop)
+        else:
+            window = nwItem.window(start, stop)
+
+    basename = os.path.join(out, "{}_{}{}".format(network.name, mode, '_' + tag if tag else ''))
+    written = []
+    figureFormats = [fmt for fmt in formats if fmt != 'csv']
+    if figureFormats:
+        fig = Figure(figsize=(8, 4.5), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        setupAxes(ax, mode)
+        for m, n in params:
+            plotTrace(ax, nwItem, mode, m, n, window)
+        if xlim is not None:
+            ax.set_xlim(*xlim)
+        ax.legend()
+        fig.tight_layout()
+        for fmt in figureFormats:
+            path = "{}.{}".format(basename, fmt)
+            if fmt == 'tex':
+                writeTikz(fig, path, tolerance, external)
+            else:
+                fig.savefig(path)
+            written.append(path)
+    if 'csv' in formats:
+        path = basename + '.csv'
+        writeCSV(network, mode, path, window)
+        written.append(path)
+    return written
+
+
+def renderFile(filename: str, args) -> list[str]:
+    from networkitem import NetworkItem
+    from networkloader import parseTouchstone, buildNetwork
+    nwItem = NetworkItem(buildNetwork(*parseTouchstone(filename)))
+    return renderNetwork(nwItem, args.mode, args.range, args.params, args.format, args.out, args.dpi,
+                         tolerance=args.tolerance, external=args.external_data)
+
+
+def main(argv) -> int:
+    matplotlib.use('Agg')
+    args = parseArgs(argv)
+    os.makedirs(args.out, exist_ok=True)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {executor.submit(renderFile, filename, args): filename for filename in args.files}
+        for i, future in enumerate(as_completed(futures), 1):
+            filename = futures[future]
+            try:
+                written = future.result()
+                print("[{}/{}] {} -> {}".format(i, len(futures), filename, ', '.join(written)))
+            except Exception as e:
+                failed += 1
+                print("[{}/{}] {} failed: {}".format(i, len(futures), filename, e), file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+import numpy as npy
+
+repoDirectory = os.path.dirname(os.path.abspath(__file__))
+
+
+def syntheticNetwork(nports: int, points: int, seed: int = 0):
+    # a few damped resonances and a line delay per path, passive and smooth like a real DUT
+    rng = npy.random.default_rng(seed)
+    f = npy.linspace(10e6, 20e9, points)
+    s = npy.empty((points, nports, nports), dtype=complex)
+    for m in range(nports):
+        for n in range(nports):
+            delay = rng.uniform(0.1e-9, 2e-9)
+            f0 = rng.uniform(2e9, 18e9, 3)
+            q = rng.uniform(20, 200, 3)
+            resonance = sum(1 / (1 + 1j * qi * (f / fi - fi / f)) for fi, qi in zip(f0, q)) / 3
+            magnitude = 0.9 * resonance if m == n else 0.9 * (1 - resonance)
+            s[:, m, n] = magnitude * npy.exp(-2j * npy.pi * f * delay)
+    s += 1e-4 * (rng.standard_normal(s.shape) + 1j * rng.standard_normal(s.shape))
+    return f, s
+
+
+def datasetPath(directory: str, nports: int, points: int) -> str:
+    path = os.path.join(directory, 'synthetic_{}.s{}p'.format(points, nports))
+    if not os.path.exists(path):
+        from touchstone import writeTouchstone
+        f, s = syntheticNetwork(nports, points)
+        writeTouchstone(path, f, s, comment='synthetic {}-port, {} points'.format(nports, points))
+    return path
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - t)
+    return {'first': runs[0], 'min': min(runs), 'mean': statistics.mean(runs), 'runs': len(runs)}
+
+
+def waitFor(app, condition, timeout: float = 120.):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("gave up waiting after {} s".format(timeout))
+        app.processEvents()
+        time.sleep(0.001)
+
+
+class Runner:
+    def __init__(self, args):
+        self.args = args
+        self.results = {}
+
+    def run(self, name: str, func, setup=None, repeat: int = None):
+        try:
+            result = measure(func, repeat or self.args.repeat, setup)
+        except Exception as e:
+            traceback.print_exc()
+            result = {'error': str(e)}
+        self.results[name] = result
+        if 'error' in result:
+            print("{:<48} failed: {}".format(name, result['error']))
+        else:
+            print("{:<48} {:10.2f} ms  (first {:.2f} ms)".format(name, result['min'] * 1e3, result['first'] * 1e3))
+        return result
+
+    def benchmarkWindow(self, app, window, path: str, label: str):
+        from PyQt5.QtCore import QItemSelectionModel
+        from PyQt5.QtWidgets import QFileDialog
+        from mplcanvas import plotModes
+        from touchstone import cachePath
+
+        canvas = window.canvas
+        model = window.networkModel
+        args = self.args
+
+        def dropCache():
+            if os.path.exists(cachePath(path)):
+                os.remove(cachePath(path))
+
+        def clear():
+            model.removeRows(0, model.rowCount())
+
+        self.run('readFile/cold/' + label, lambda: window.readFile(path), setup=lambda: (clear(), dropCache()))
+        self.run('readFile/cached/' + label, lambda: window.readFile(path), setup=clear)
+
+        for title, mode in plotModes.items():
+            if args.modes and mode not in args.modes:
+                continue
+            window.plotSelectorBox.setCurrentIndex(list(plotModes.values()).index(mode))
+            self.run('redrawAll/{}/{}'.format(mode, label), lambda: (canvas.redrawAll(), canvas.draw()))
+        window.plotSelectorBox.setCurrentIndex(0)
+
+        window.selectionModel.select(model.index(0, 0), QItemSelectionModel.ClearAndSelect)
+        window.plugins.activate('time_gating')
+        plugin = window.plugins._activate['time_gating'].__self__
+        plugin.dialog.centerTimeEdit.setText('0.5 ns')
+        plugin.dialog.spanTimeEdit.setText('1 ns')
+        rows = model.rowCount
+
+        def gate():
+            expected = rows() + 1
+            plugin.gate(plugin.dialog.values())
+            waitFor(app, lambda: rows() >= expected)
+
+        def dropGated():
+            model.removeRows(1, rows() - 1)
+        plugin.dialog.close()
+        self.run('timeGate/' + label, gate, setup=dropGated)
+        dropGated()
+
+        out = tempfile.mkdtemp(prefix='radiolarite-bench-')
+        saveName = {'csv': os.path.join(out, 'bench.csv'), 'tex': os.path.join(out, 'bench.tex')}
+        original = QFileDialog.getSaveFileName
+        try:
+            QFileDialog.getSaveFileName = staticmethod(
+                lambda *a, **kw: (saveName['tex' if 'LaTex' in kw.get('filter', '') else 'csv'], ''))
+            self.run('exportCSV/' + label, window.exportData)
+            self.run('exportTikz/' + label, window.exportFigure, setup=lambda: (canvas.redrawAll(), canvas.draw()))
+        finally:
+            QFileDialog.getSaveFileName = original
+        clear()
+
+    def main(self) -> dict:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        os.chdir(repoDirectory)
+        sys.path.insert(0, repoDirectory)
+        import matplotlib
+        matplotlib.use('Qt5Agg')
+        from PyQt5.QtWidgets import QApplication, QMessageBox
+        from mainwindow import MainWindow
+
+        app = QApplication.instance() or QApplication([])
+        QMessageBox.critical = lambda *a: print("critical:", a[-1])  # never block on a dialog
+        window = MainWindow()
+        window.resize(1280, 800)
+        window.show()
+        app.processEvents()
+
+        # one-off costs (skrf import on the first file, spawning the worker pool) are reported on their own
+        import workerpool
+        self.run('readFile/first/test.s1p', lambda: window.readFile('test.s1p'), repeat=1)
+        window.networkModel.removeRows(0, window.networkModel.rowCount())
+        self.run('workerpool/spawn', lambda: list(workerpool.executor().map(abs, range(workerpool.workers()))),
+                 repeat=1)
+
+        directory = self.args.data or tempfile.mkdtemp(prefix='radiolarite-data-')
+        os.makedirs(directory, exist_ok=True)
+        for nports in self.args.ports:
+            for points in self.args.points:
+                t = time.perf_counter()
+                path = datasetPath(directory, nports, points)
+                print("dataset {} ({:.1f} s)".format(os.path.basename(path), time.perf_counter() - t))
+                self.benchmarkWindow(app, window, path, '{}port/{}'.format(nports, points))
+        window.close()
+        return self.results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repoDirectory,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'commit': commit, 'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+            'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+
+def compare(baseline: dict, results: dict):
+    print("\n{:<48} {:>10} {:>10} {:>8}".format('benchmark', 'before', 'after', 'ratio'))
+    for name, after in results.items():
+        before = baseline.get('results', {}).get(name)
+        if not before or 'min' not in before or 'min' not in after:
+            continue
+        ratio = after['min'] / before['min'] if before['min'] else float('inf')
+        flag = '  slower' if ratio > 1.2 else ''
+        print("{:<48} {:10.2f} {:10.2f} {:7.2f}x{}".format(name, before['min'] * 1e3, after['min'] * 1e3, ratio, flag))
+
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(description='Time the hot paths of Radiolarite on synthetic Touchstone files.')
+    parser.add_argument('--ports', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='sweep lengths, add 1000000 for the full run')
+    parser.add_argument('--modes', nargs='+', default=None, help='plot modes to redraw (default: all)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--data', default=None, help='directory to keep generated files in between runs')
+    parser.add_argument('--out', default='benchmark.json')
+    parser.add_argument('--compare', default=None, metavar='JSON', help='results of an earlier run')
+    args = parser.parse_args(argv)
+    for attr in ('data', 'out', 'compare'):  # the runner changes into the repository
+        if getattr(args, attr):
+            setattr(args, attr, os.path.abspath(getattr(args, attr)))
+    return args
+
+
+def main(argv) -> int:
+    args = parseArgs(argv)
+    results = Runner(args).main()
+    with open(args.out, 'w') as file:
+        json.dump({'meta': metadata(), 'results': results}, file, indent=1)
+    print("written to " + args.out)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+    return 1 if any('error' in r for r in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,180 @@
+import numpy as npy
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
+from matplotlib.transforms import offset_copy
+
+from tracedata import axisLabels, timeModes
+
+
+def nearestIndex(xs: npy.ndarray, x: float) -> int:
+    # binary search on an ascending axis
+    i = int(npy.searchsorted(xs, x))
+    if i <= 0:
+        return 0
+    if i >= len(xs):
+        return len(xs) - 1
+    return i if xs[i] - x < x - xs[i - 1] else i - 1
+
+
+class DataCursor:
+    # hover crosshair and numbered markers of an MplCanvas. The artists are not part of the axes,
+    # they are only drawn into the blitted overlay, so relim, the legend and exports never see them.
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.enabled = False
+        self.hover: tuple[Line2D, int] = None  # trace and sample index under the mouse
+        self.markers: list[tuple[Line2D, str, float]] = []  # trace, domain and position on its axis
+        self._ax = None
+        self._artists = None
+
+    def domain(self) -> str:
+        return 'time' if self.canvas.plotMode in timeModes else 'frequency'
+
+    def samples(self, trace: Line2D):
+        # full resolution x, y and the ascending axis used for snapping: time or frequency, also on the smith chart
+        x, y = self.canvas.traceData(trace)
+        if self.canvas.plotMode != 'smith':
+            return x, x, y
+        nwItem = self.canvas.trace2param[trace].parent()
+        f = nwItem.frequency(self.canvas.frequencyWindow(nwItem)) / nwItem.network().frequency.multiplier
+        return f, x, y
+
+    def snap(self, event) -> tuple[Line2D, int]:
+        canvas = self.canvas
+        ax = canvas.axes()
+        if event.inaxes is not ax or event.xdata is None:
+            return None
+        if canvas.picked in canvas.trace2param:
+            traces = [canvas.picked]
+        else:
+            traces = [trace for trace in canvas.trace2param if trace.get_visible()]
+        best, distance = None, npy.inf
+        for trace in traces:
+            axis, x, y = self.samples(trace)
+            if len(x) == 0:
+                continue
+            if canvas.plotMode == 'smith':  # no ascending axis under the mouse, nearest point instead
+                i = int(npy.argmin((x - event.xdata) ** 2 + (y - event.ydata) ** 2))
+            else:
+                i = nearestIndex(x, event.xdata)
+            px, py = ax.transData.transform((x[i], y[i]))
+            d = npy.hypot(px - event.x, py - event.y)
+            if d < distance:
+                best, distance = (trace, i), d
+        return best
+
+    def addMarker(self):
+        if self.hover is None:
+            return
+        trace, i = self.hover
+        axis, _, _ = self.samples(trace)
+        self.markers.append((trace, self.domain(), float(axis[i])))
+
+    def clearMarkers(self):
+        self.markers = []
+
+    def resolvedMarkers(self) -> list[tuple[int, Line2D, int]]:
+        # markers of the current domain on shown traces, numbered in placement order
+        self.markers = [m for m in self.markers if m[0] in self.canvas.trace2param]
+        result = []
+        for number, (trace, domain, position) in enumerate(self.markers, start=1):
+            if domain == self.domain() and trace.get_visible():
+                axis, x, _ = self.samples(trace)
+                if len(x):
+                    result.append((number, trace, nearestIndex(axis, position)))
+        return result
+
+    def artists(self):
+        ax = self.canvas.axes()
+        if self._ax is not ax:  # axes are replaced on every redraw
+            self._ax = ax
+            figure = self.canvas.figure
+            vline = Line2D([0, 0], [0, 1], transform=ax.get_xaxis_transform(), color='grey', linewidth=0.8,
+                           linestyle='--')
+            hline = Line2D([0, 1], [0, 0], transform=ax.get_yaxis_transform(), color='grey', linewidth=0.8,
+                           linestyle='--')
+            point = Line2D([], [], transform=ax.transData, marker='o', markersize=6, markerfacecolor='none',
+                           color='black', linestyle='none')
+            markers = Line2D([], [], transform=ax.transData, marker='v', markersize=7, color='black',
+                             linestyle='none')
+            readout = Text(0.01, 0.01, '', transform=ax.transAxes, va='bottom', ha='left', fontsize='small',
+                           family='monospace', bbox=dict(boxstyle='round', facecolor='white', alpha=0.85))
+            self._artists = vline, hline, point, markers, readout, []
+            for artist in self._artists[:-1]:
+                artist.set_figure(figure)
+                artist.set_clip_box(ax.bbox)
+            readout.set_clip_on(False)
+        return self._artists
+
+    def draw(self):
+        if not self.enabled and not self.markers:
+            return
+        canvas = self.canvas
+        vline, hline, point, markers, readout, labels = self.artists()
+        lines = []
+        smith = canvas.plotMode == 'smith'
+        hover = self.hover if self.enabled and self.hover is not None and self.hover[0] in canvas.trace2param else None
+        if hover is not None:
+            trace, i = hover
+            axis, x, y = self.samples(trace)
+            if i < len(x):
+                if not smith:
+                    vline.set_xdata([x[i], x[i]])
+                    hline.set_ydata([y[i], y[i]])
+                    canvas.figure.draw_artist(vline)
+                    canvas.figure.draw_artist(hline)
+                point.set_data([x[i]], [y[i]])
+                canvas.figure.draw_artist(point)
+                lines.append(self.describe(' ', trace, axis[i], x[i], y[i]))
+
+        resolved = self.resolvedMarkers()
+        if resolved:
+            xs, ys = [], []
+            first = None
+            for number, trace, i in resolved:
+                axis, x, y = self.samples(trace)
+                xs.append(x[i])
+                ys.append(y[i])
+                lines.append(self.describe(str(number), trace, axis[i], x[i], y[i]))
+                if first is None:
+                    first = axis[i], y[i]
+                else:
+                    lines.append(self.describeDelta(number, resolved[0][0], axis[i] - first[0], y[i] - first[1]))
+            markers.set_data(xs, ys)
+            canvas.figure.draw_artist(markers)
+            ax = canvas.axes()
+            for n, (number, _, _) in enumerate(resolved):
+                if n >= len(labels):
+                    label = Text(0, 0, '', transform=offset_copy(ax.transData, canvas.figure, y=6, units='points'),
+                                 ha='center', va='bottom', fontsize='small')
+                    label.set_figure(canvas.figure)
+                    labels.append(label)
+                labels[n].set_position((xs[n], ys[n]))
+                labels[n].set_text(str(number))
+                canvas.figure.draw_artist(labels[n])
+
+        if lines:
+            readout.set_text('\n'.join(lines))
+            canvas.figure.draw_artist(readout)
+
+    def units(self, trace: Line2D) -> tuple[str, str]:
+        nwItem = self.canvas.trace2param[trace].parent()
+        mode = self.canvas.plotMode
+        xunit = 'ns' if mode in timeModes else nwItem.network().frequency.unit
+        return xunit, axisLabels(mode, nwItem)[1]
+
+    def describe(self, tag: str, trace: Line2D, position: float, x: float, y: float) -> str:
+        xunit, ylabel = self.units(trace)
+        if self.canvas.plotMode == 'smith':
+            value = "Γ = {:.4f}{:+.4f}j".format(x, y)
+        else:
+            value = "{} = {:.6g}".format(ylabel, y)
+        return "{} {}: {:.6g} {}, {}".format(tag, trace.get_label(), position, xunit, value)
+
+    def describeDelta(self, number: int, reference: int, dx: float, dy: float) -> str:
+        trace = self.markers[number - 1][0]
+        xunit, ylabel = self.units(trace)
+        text = "Δ{}-{}: {:+.6g} {}".format(number, reference, dx, xunit)
+        if self.canvas.plotMode != 'smith':
+            text += ", {:+.6g}".format(dy)
+        return text
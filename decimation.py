@@ -0,0 +1,61 @@
+import numpy as npy
+
+
+def _extremaIndices(y: npy.ndarray, bins: int) -> list[npy.ndarray]:
+    # index of the minimum and maximum of each of `bins` equally long chunks
+    n = len(y)
+    chunk = -(-n // bins)
+    full = (n // chunk) * chunk
+    blocks = y[:full].reshape(-1, chunk)
+    base = npy.arange(blocks.shape[0]) * chunk
+    idx = [blocks.argmin(axis=1) + base, blocks.argmax(axis=1) + base]
+    if full < n:
+        tail = y[full:]
+        idx.append(npy.array([full + tail.argmin(), full + tail.argmax()]))
+    return idx
+
+
+def minmaxIndices(y: npy.ndarray, bins: int) -> npy.ndarray:
+    n = len(y)
+    if bins <= 0 or n <= 4 * bins:
+        return npy.arange(n)
+    idx = _extremaIndices(y, bins)
+    idx.append(npy.array([0, n - 1]))
+    return npy.unique(npy.concatenate(idx))  # sorted, so min/max keep their order along x
+
+
+def decimateRectangular(x: npy.ndarray, y: npy.ndarray, xmin: float, xmax: float, pixels: int):
+    # x has to be sorted, which holds for frequency and time axes
+    start = max(npy.searchsorted(x, xmin, 'left') - 1, 0)
+    stop = min(npy.searchsorted(x, xmax, 'right') + 1, len(x))
+    xv = x[start:stop]
+    yv = y[start:stop]
+    if len(xv) <= 4 * pixels:
+        return xv, yv
+    idx = minmaxIndices(yv, pixels)
+    return xv[idx], yv[idx]
+
+
+def decimateBand(x: npy.ndarray, lo: npy.ndarray, hi: npy.ndarray, xmin: float, xmax: float, pixels: int):
+    # conservative, every chunk spans its whole x extent with its lowest low and highest high
+    start = max(npy.searchsorted(x, xmin, 'left') - 1, 0)
+    stop = min(npy.searchsorted(x, xmax, 'right') + 1, len(x))
+    xv, lov, hiv = x[start:stop], lo[start:stop], hi[start:stop]
+    n = len(xv)
+    if n <= 4 * pixels:
+        return xv, lov, hiv
+    starts = npy.arange(0, n, -(-n // pixels))
+    ends = npy.append(starts[1:], n) - 1
+    xs = npy.column_stack((xv[starts], xv[ends])).ravel()
+    return xs, npy.repeat(npy.minimum.reduceat(lov, starts), 2), npy.repeat(npy.maximum.reduceat(hiv, starts), 2)
+
+
+def decimateParametric(x: npy.ndarray, y: npy.ndarray, bins: int):
+    # curves like the Smith chart trace are not sorted along x, so keep the extrema of both coordinates
+    n = len(x)
+    if n <= 4 * bins:
+        return x, y
+    idx = _extremaIndices(x, bins) + _extremaIndices(y, bins)
+    idx.append(npy.array([0, n - 1]))
+    idx = npy.unique(npy.concatenate(idx))
+    return x[idx], y[idx]
@@ -0,0 +1,107 @@
+import os
+import re
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+re_touchstone = re.compile(r'\.s\d+p$', re.IGNORECASE)
+
+
+def fileState(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class DirectoryWatcher(QObject):
+    # emits Touchstone files that appeared or changed in the watched directories, once they stopped changing
+    filesChanged = pyqtSignal(list)
+
+    def __init__(self, parent=None, delay: int = 500):
+        super(DirectoryWatcher, self).__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.scan)
+        self._watcher.fileChanged.connect(self.fileChanged)
+        self._known: dict[str, tuple[int, int]] = {}  # file -> (mtime, size) last reported or found at watch start
+        self._pending: dict[str, tuple[int, int]] = {}  # file -> state when the change was noticed
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)  # writers save in several steps, wait until a file is quiet
+        self._timer.timeout.connect(self.settle)
+
+    def directories(self) -> list[str]:
+        return self._watcher.directories()
+
+    def watch(self, directory: str):
+        # files already in the directory count as known, only later changes are reported
+        directory = os.path.abspath(directory)
+        if directory in self._watcher.directories():
+            return
+        self._watcher.addPath(directory)
+        for path in self.touchstoneFiles(directory):
+            self._known[path] = fileState(path)
+            self._watcher.addPath(path)
+
+    def unwatch(self, directory: str = None):
+        directories = self._watcher.directories() if directory is None else [os.path.abspath(directory)]
+        for directory in directories:
+            self._watcher.removePath(directory)
+            files = [path for path in self._watcher.files() if os.path.dirname(path) == directory]
+            if files:
+                self._watcher.removePaths(files)
+            for path in [path for path in self._known if os.path.dirname(path) == directory]:
+                self._known.pop(path)
+                self._pending.pop(path, None)
+        if not self._pending:
+            self._timer.stop()
+
+    def touchstoneFiles(self, directory: str) -> list[str]:
+        try:
+            with os.scandir(directory) as entries:
+                return [os.path.join(directory, e.name) for e in entries if re_touchstone.search(e.name) and e.is_file()]
+        except OSError:
+            return []
+
+    def scan(self, directory: str):
+        # new, replaced and deleted files, in place modifications come through fileChanged
+        files = self.touchstoneFiles(directory)
+        watched = set(self._watcher.files())
+        for path in files:
+            state = fileState(path)
+            if state is not None and self._known.get(path) != state:
+                self._pending[path] = state
+            if path not in watched:
+                self._watcher.addPath(path)
+        present = set(files)
+        for path in [path for path in self._known if os.path.dirname(path) == directory and path not in present]:
+            self._known.pop(path)  # deleted, a file of the same name later on is new again
+        if self._pending:
+            self._timer.start()
+
+    def fileChanged(self, path: str):
+        state = fileState(path)
+        if state is None:
+            return  # removed or replaced, scan sees the new file
+        if path not in self._watcher.files():
+            self._watcher.addPath(path)  # some editors and instruments replace the file, which drops the watch
+        if self._known.get(path) != state:
+            self._pending[path] = state
+            self._timer.start()
+
+    def settle(self):
+        ready = []
+        for path, state in list(self._pending.items()):
+            now = fileState(path)
+            if now is None or now[1] == 0:
+                self._pending.pop(path)  # gone, or created but not written yet, the write triggers again
+            elif now != state:
+                self._pending[path] = now  # still being written
+            else:
+                self._pending.pop(path)
+                self._known[path] = now
+                ready.append(path)
+        if self._pending:
+            self._timer.start()
+        if ready:
+            self.filesChanged.emit(sorted(ready))
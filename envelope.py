@@ -0,0 +1,55 @@
+import numpy as npy
+
+from networkitem import NetworkItem
+from resample import gridKey
+from tracedata import projections
+
+envelopeModes = list(projections)  # quantities per frequency point, no Smith chart or time domain
+bands = {
+    'min/max': None,
+    '5-95 %': (5, 95),
+    '10-90 %': (10, 90),
+    '25-75 %': (25, 75),
+}
+
+
+def disjoint(items: list[NetworkItem]) -> list[NetworkItem]:
+    # networks whose sweep doesn't reach into the one of the first, they would only contribute NaN
+    f = items[0].frequency()
+    return [item for item in items[1:] if len(item.frequency()) == 0
+            or item.frequency()[-1] < f[0] or item.frequency()[0] > f[-1]]
+
+
+def commonParams(items: list[NetworkItem]) -> list[tuple[int, int]]:
+    # parameters enabled in every network, in the order of the first
+    enabled = [set(item.enabledParamsTuple()) for item in items]
+    return [p for p in items[0].enabledParamsTuple() if all(p in e for e in enabled)]
+
+
+def envelopeStats(y: npy.ndarray, percentiles: tuple[float, float] = None):
+    # y is (networks, points), all statistics are reductions over the network axis
+    mean = y.mean(axis=0)
+    std = y.std(axis=0)
+    if percentiles is None:
+        lo, hi = y.min(axis=0), y.max(axis=0)
+    else:
+        lo, hi = npy.percentile(y, percentiles, axis=0)
+    return mean, std, lo, hi
+
+
+def envelope(items: list[NetworkItem], mode: str, m: int, n: int, window: slice = None,
+             percentiles: tuple[float, float] = None, out: npy.ndarray = None):
+    # one (m, n) on the frequency grid of the first network, stacked and reduced in a single pass.
+    # Other grids are resampled onto it, points outside their sweep are NaN and leave a gap.
+    # out is a (networks, points) scratch buffer that can be shared by all parameters
+    project = projections[mode][0]
+    f = items[0].frequency(window)
+    key = gridKey(f)
+    if out is None:
+        out = npy.empty((len(items), len(f)))
+    for i, item in enumerate(items):
+        if item.gridKey() == items[0].gridKey():
+            out[i] = project(item.sParam(m, n, window))
+        else:
+            out[i] = project(item.resampledParam(m, n, f, key))
+    return envelopeStats(out, percentiles)
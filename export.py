@@ -0,0 +1,275 @@
+import os
+
+import numpy as npy
+
+from tracedata import projections
+
+chunkSize = 65536  # frequency points per block, bounds memory use independent of the sweep length
+dataFormats = {  # file dialog filter -> default extension, .snp becomes .s1p, .s2p, ...
+    'CSV (*.csv)': '.csv',
+    'Touchstone (*.s*p)': '.snp',
+    'Parquet (*.parquet)': '.parquet',
+    'HDF5 (*.h5 *.hdf5)': '.h5',
+}
+
+
+tikzTolerance = 0.25  # pt, how far the simplified curves may deviate from the plotted ones, 0 keeps every point
+
+
+def copyFigure(figure, fulldata: dict = None):
+    # tikz export trims and simplifies lines, do it on a copy so the canvas keeps all of its data.
+    # fulldata maps canvas lines to their undecimated x, y, the copy gets those instead of the screen resolution
+    import gc
+    import pickle
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    # transforms pickle their weakref dict of parents, a collection that drops dead parents
+    # while it is iterated makes dumps fail, so collect first and hold the collector off
+    collecting = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        data = pickle.dumps(figure)
+    finally:
+        if collecting:
+            gc.enable()
+    copy = pickle.loads(data)
+    FigureCanvasAgg(copy)
+    if fulldata:
+        for ax, axCopy in zip(figure.axes, copy.axes):
+            for line, lineCopy in zip(ax.get_lines(), axCopy.get_lines()):  # pickling keeps the order
+                if line in fulldata:
+                    lineCopy.set_data(*fulldata[line][:2])
+    return copy
+
+
+def vectorSmith(figure):
+    # the canvas shows the smith chart as an image, the copy gets skrf's circles back
+    from smithchart import backgroundGid, drawSmith
+    for ax in figure.axes:
+        for image in ax.get_images():
+            if image.get_gid() == backgroundGid:
+                xlim, ylim = ax.get_xlim(), ax.get_ylim()
+                image.remove()
+                drawSmith(ax)
+                ax.set_xlim(xlim)
+                ax.set_ylim(ylim)
+
+
+def simplify(points: npy.ndarray, tolerance: float) -> npy.ndarray:
+    # Ramer-Douglas-Peucker, returns the indices of the points to keep. All segments of one
+    # recursion level are split at once, the python loop only runs once per level.
+    keep = npy.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    firsts, lasts = npy.array([0]), npy.array([len(points) - 1])
+    while len(firsts):
+        split = lasts - firsts >= 2
+        firsts, lasts = firsts[split], lasts[split]
+        if not len(firsts):
+            break
+        counts = lasts - firsts - 1
+        offsets = npy.cumsum(counts) - counts
+        segment = npy.repeat(npy.arange(len(firsts)), counts)
+        index = firsts[segment] + 1 + npy.arange(counts.sum()) - offsets[segment]
+        a = points[firsts][segment]
+        d = points[lasts][segment] - a
+        inner = points[index] - a
+        length = npy.hypot(d[:, 0], d[:, 1])
+        distance = npy.where(length > 0, npy.abs(d[:, 0] * inner[:, 1] - d[:, 1] * inner[:, 0])
+                             / npy.where(length > 0, length, 1), npy.hypot(inner[:, 0], inner[:, 1]))
+        maxima = npy.maximum.reduceat(distance, offsets)
+        candidates = npy.flatnonzero(distance == maxima[segment])
+        segments, first = npy.unique(segment[candidates], return_index=True)  # first maximum per segment
+        farthest = index[candidates[first]]
+        split = maxima[segments] > tolerance
+        segments, farthest = segments[split], farthest[split]
+        keep[farthest] = True
+        firsts, lasts = npy.concatenate((firsts[segments], farthest)), npy.concatenate((farthest, lasts[segments]))
+    return npy.flatnonzero(keep)
+
+
+def reduceLine(line, tolerance: float):
+    x = npy.asarray(line.get_xdata(), dtype=float)
+    y = npy.asarray(line.get_ydata(), dtype=float)
+    if len(x) < 3:
+        return
+    # work in output points, so the tolerance means the same on every axis scale
+    scale = 72. / line.figure.dpi
+    xy = line.get_transform().transform(npy.column_stack((x, y))) * scale
+    finite = npy.isfinite(xy).all(axis=1)
+    x0, y0, x1, y1 = line.axes.bbox.extents * scale
+    inside = finite & (xy[:, 0] >= x0) & (xy[:, 0] <= x1) & (xy[:, 1] >= y0) & (xy[:, 1] <= y1)
+    # one point beyond the box on either side, so the curves still reach the axis edges
+    visible = inside.copy()
+    visible[:-1] |= inside[1:]
+    visible[1:] |= inside[:-1]
+    visible &= finite
+
+    edges = npy.flatnonzero(npy.diff(npy.concatenate(([0], visible.astype(npy.int8), [0]))))
+    xs, ys = [], []
+    for start, stop in zip(edges[::2], edges[1::2]):
+        index = start + (simplify(xy[start:stop], tolerance) if tolerance > 0 else npy.arange(stop - start))
+        if xs:  # pgfplots jumps over the gap
+            xs.append([npy.nan])
+            ys.append([npy.nan])
+        xs.append(x[index])
+        ys.append(y[index])
+    if xs:
+        line.set_data(npy.concatenate(xs), npy.concatenate(ys))
+    else:
+        line.set_visible(False)
+
+
+def writeTikz(figure, filename: str, tolerance: float = None, external: bool = False, fulldata: dict = None):
+    # external writes every curve to a .dat table next to the .tex, which pgfplots reads a lot faster
+    import tikzplotlib
+    from matplotlib.lines import Line2D
+    figure = copyFigure(figure, fulldata)
+    vectorSmith(figure)
+    tolerance = tikzTolerance if tolerance is None else tolerance
+    for ax in figure.axes:
+        for line in ax.get_lines():
+            if isinstance(line, Line2D) and line.get_visible():
+                reduceLine(line, tolerance)
+    code = tikzplotlib.get_tikz_code(figure=figure, filepath=filename, standalone=True, float_format='.7g',
+                                     externalize_tables=external, override_externals=True)
+    if external:  # tikzplotlib 0.10 leaves its format placeholder in external table references
+        code = code.replace("table {opts_str}", "table ")
+    with open(filename, "w", encoding='utf8') as f:
+        f.write(code)
+
+
+def dataFormat(filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    elif ext == '.parquet':
+        return 'parquet'
+    elif ext in ('.h5', '.hdf5'):
+        return 'hdf5'
+    elif ext.startswith('.s') and ext.endswith('p'):
+        return 'touchstone'
+    raise ValueError("Unknown export format '{}'".format(ext))
+
+
+def columns(nports: int, plot_mode: str) -> list[tuple[str, int, int, callable]]:
+    # same column names and order as skrf's to_dataframe, smith exports real and imaginary part
+    if plot_mode == 'smith':
+        modes = ['re', 'im']
+    elif plot_mode in projections:
+        modes = [plot_mode]
+    else:
+        raise ValueError("Data export is not available for plot mode '{}'".format(plot_mode))
+    return [("s_{} {}{}".format(mode, m + 1, n + 1), m, n, projections[mode][0])
+            for mode in modes for n in range(nports) for m in range(nports)]
+
+
+def chunks(network, plot_mode: str, window: slice = None, chunk: int = chunkSize):
+    # (frequency in the network's unit, values) blocks, straight from the (possibly memory-mapped) S-array
+    f = network.frequency.f
+    s = network.s.val
+    start, stop, _ = (window or slice(None)).indices(len(f))
+    cols = columns(s.shape[1], plot_mode)
+    for first in range(start, stop, chunk):
+        last = min(first + chunk, stop)
+        block = npy.asarray(s[first:last])
+        values = npy.empty((last - first, len(cols)))
+        for i, (_, m, n, func) in enumerate(cols):
+            values[:, i] = func(block[:, m, n])
+        yield f[first:last] / network.frequency.multiplier, values
+
+
+def frequencyHeader(network) -> str:
+    return 'Frequency ({})'.format(network.frequency.unit)
+
+
+def writeCSV(network, plot_mode: str, filename: str, window: slice = None):
+    header = [frequencyHeader(network)] + [c[0] for c in columns(network.nports, plot_mode)]
+    with open(filename, 'w') as fh:
+        fh.write(' '.join('"{}"'.format(h) for h in header) + '\n')
+        for f, values in chunks(network, plot_mode, window):
+            npy.savetxt(fh, npy.column_stack((f, values)), fmt='%.15g', delimiter=' ')
+
+
+def writeParquet(network, plot_mode: str, filename: str, window: slice = None):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet export needs pyarrow, pip install pyarrow")
+    names = [frequencyHeader(network)] + [c[0] for c in columns(network.nports, plot_mode)]
+    schema = pyarrow.schema([(name, pyarrow.float64()) for name in names])
+    with pyarrow.parquet.ParquetWriter(filename, schema) as writer:
+        for f, values in chunks(network, plot_mode, window):  # one row group per chunk
+            arrays = [pyarrow.array(f)] + [pyarrow.array(values[:, i]) for i in range(values.shape[1])]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+
+
+def writeHDF5(network, plot_mode: str, filename: str, window: slice = None):
+    try:
+        import h5py
+    except ImportError:
+        raise ValueError("HDF5 export needs h5py, pip install h5py")
+    cols = columns(network.nports, plot_mode)
+    start, stop, _ = (window or slice(None)).indices(len(network.frequency.f))
+    with h5py.File(filename, 'w') as h5:
+        h5.attrs['name'] = network.name
+        h5.attrs['plot_mode'] = plot_mode
+        frequency = h5.create_dataset('frequency', shape=(stop - start,), dtype='f8', chunks=True)
+        frequency.attrs['unit'] = network.frequency.unit
+        values = h5.create_dataset('values', shape=(stop - start, len(cols)), dtype='f8', chunks=True)
+        values.attrs['columns'] = [c[0] for c in cols]
+        offset = 0
+        for f, block in chunks(network, plot_mode, window):
+            frequency[offset:offset + len(f)] = f
+            values[offset:offset + len(f)] = block
+            offset += len(f)
+
+
+def writeNetworkTouchstone(network, filename: str, window: slice = None):
+    from touchstone import writeTouchstone
+    window = window or slice(None)
+    writeTouchstone(filename, network.frequency.f[window], network.s.val[window], z0=float(network.z0[0, 0].real),
+                    unit=network.frequency.unit, comment='exported by Radiolarite', chunk=chunkSize)
+
+
+def exportNetwork(network, plot_mode: str, filename: str, window: slice = None) -> str:
+    fmt = dataFormat(filename)
+    if fmt == 'csv':
+        writeCSV(network, plot_mode, filename, window)
+    elif fmt == 'parquet':
+        writeParquet(network, plot_mode, filename, window)
+    elif fmt == 'hdf5':
+        writeHDF5(network, plot_mode, filename, window)
+    else:
+        filename = os.path.splitext(filename)[0] + '.s{}p'.format(network.nports)  # the extension is the port count
+        writeNetworkTouchstone(network, filename, window)
+    return filename
+
+
+def uniqueNames(names: list[str]) -> list[str]:
+    # the second 'dut' becomes 'dut_2', compared without case for Windows and macOS file systems
+    taken = set(name.lower() for name in names)
+    seen = set()
+    result = []
+    for name in names:
+        unique = name
+        if name.lower() in seen:
+            i = 2
+            while "{}_{}".format(name, i).lower() in taken:
+                i += 1
+            unique = "{}_{}".format(name, i)
+            taken.add(unique.lower())
+        seen.add(name.lower())
+        result.append(unique)
+    return result
+
+
+def exportNetworks(networks: list, plot_mode: str, filename: str) -> list[str]:
+    # several networks go next to each other, named after the network with the chosen extension
+    if len(networks) == 1:
+        return [exportNetwork(networks[0], plot_mode, filename)]
+    directory = os.path.dirname(filename)
+    ext = os.path.splitext(filename)[1]
+    names = uniqueNames([network.name for network in networks])  # two files can load as the same name
+    return [exportNetwork(network, plot_mode, os.path.join(directory, name + ext))
+            for network, name in zip(networks, names)]
@@ -0,0 +1,230 @@
+import os
+from concurrent.futures import Future
+
+import numpy as npy
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, pyqtSignal, Qt
+from PyQt5.QtWidgets import QWidget, QFormLayout, QListWidget, QListWidgetItem, QLineEdit, QCheckBox, QHBoxLayout, \
+    QPushButton, QProgressBar, QPlainTextEdit, QFileDialog
+
+import workerpool
+from batch import renderNetwork, rangeFits, rangeTag
+from networkitem import NetworkItem
+from networkstore import storeArray, storedPath
+from tracedata import timeModes
+
+exportFormats = ['tex', 'pdf', 'png', 'csv']
+
+
+def renderJob(name, f, s, z0, params, mode, rangeText, formats, out, dpi, tag):
+    # runs in a worker process, s is the path of a port-major .npy so every job maps the same file
+    from networkloader import buildNetwork
+    nwItem = NetworkItem(buildNetwork(name, f, s, z0))
+    return renderNetwork(nwItem, mode, rangeText, params, formats, out, dpi, tag)
+
+
+def networkArgs(nwItem: NetworkItem, storeDir: str):
+    nw = nwItem.network()
+    s = nw.s.val
+    # in RAM, or mapped out of a session zip the workers can't open: written once, shared by all jobs
+    path = storedPath(s, storeDir) or storeArray(storeDir, npy.asarray(s))
+    params = ["{}{}".format(p.m + 1, p.n + 1) for p in nwItem.enabledParams()] or None  # none enabled: all
+    return nw.name, nw.frequency.f, path, nw.z0, params
+
+
+class ExportQueue(QObject):
+    progress = pyqtSignal(int, int, str)
+    jobFailed = pyqtSignal(str, str)
+    finished = pyqtSignal()
+    _futureDone = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super(ExportQueue, self).__init__(parent)
+        self._pending: dict[Future, str] = {}
+        self._keep = []  # arrays whose store files the queued jobs map, a removed network doesn't delete them
+        self._total = 0
+        self._done = 0
+        self._futureDone.connect(self._collect)
+
+    def isRunning(self) -> bool:
+        return len(self._pending) > 0
+
+    def submit(self, jobs: list[tuple[str, tuple]], keep: list = ()):
+        # jobs are (label, renderJob arguments)
+        executor = workerpool.executor()
+        self._keep.extend(keep)
+        self._total += len(jobs)
+        for label, args in jobs:
+            future = executor.submit(renderJob, *args)
+            self._pending[future] = label
+            future.add_done_callback(self._futureDone.emit)
+        self.progress.emit(self._done, self._total, '')
+
+    def cancel(self):
+        # running jobs finish so their files are complete, queued ones are dropped
+        for future in list(self._pending.keys()):
+            future.cancel()
+
+    def _collect(self, future: Future):
+        label = self._pending.pop(future, None)
+        if label is None:
+            return
+        self._done += 1
+        message = ''
+        if future.cancelled():
+            message = label + ' cancelled'
+        elif future.exception() is not None:
+            self.jobFailed.emit(label, str(future.exception()))
+        else:
+            message = ', '.join(os.path.basename(w) for w in future.result())
+        self.progress.emit(self._done, self._total, message)
+        if not self._pending:
+            self._finish()
+
+    def _finish(self):
+        self._total = 0
+        self._done = 0
+        self._keep.clear()
+        self.finished.emit()
+
+
+class ExportQueueDialog(QWidget):
+    closed = pyqtSignal()
+
+    def __init__(self, networkModel, store, plotModes: dict, parent=None):
+        super(ExportQueueDialog, self).__init__(parent=parent)
+        self.setWindowTitle("Export Queue")
+        self.networkModel = networkModel
+        self.store = store
+        self.queue = ExportQueue(self)
+        formlayout = QFormLayout()
+        self.setLayout(formlayout)
+
+        self.networkList = QListWidget(self)
+        formlayout.addRow("Networks", self.networkList)
+        self.modeList = QListWidget(self)
+        for title, mode in plotModes.items():
+            item = QListWidgetItem(title)
+            item.setData(Qt.UserRole, mode)
+            item.setCheckState(Qt.Unchecked)
+            self.modeList.addItem(item)
+        formlayout.addRow("Plot modes", self.modeList)
+        self.rangeEdit = QLineEdit(self)
+        self.rangeEdit.setPlaceholderText("full range, or e.g. 7-9GHz; 0-5ns")
+        formlayout.addRow("Ranges", self.rangeEdit)
+
+        formatLayout = QHBoxLayout()
+        self.formatChecks = {}
+        for fmt in exportFormats:
+            self.formatChecks[fmt] = QCheckBox(fmt, self)
+            formatLayout.addWidget(self.formatChecks[fmt])
+        self.formatChecks['tex'].setChecked(True)
+        formlayout.addRow("Formats", formatLayout)
+
+        outLayout = QHBoxLayout()
+        self.outEdit = QLineEdit(os.getcwd(), self)
+        browseButton = QPushButton("...", self)
+        browseButton.clicked.connect(self.browse)
+        outLayout.addWidget(self.outEdit)
+        outLayout.addWidget(browseButton)
+        formlayout.addRow("Output", outLayout)
+
+        buttonLayout = QHBoxLayout()
+        self.startButton = QPushButton("Start", self)
+        self.startButton.clicked.connect(self.start)
+        self.cancelButton = QPushButton("Cancel", self)
+        self.cancelButton.setEnabled(False)
+        self.cancelButton.clicked.connect(self.queue.cancel)
+        buttonLayout.addWidget(self.startButton)
+        buttonLayout.addWidget(self.cancelButton)
+        formlayout.addRow("", buttonLayout)
+        self.progressBar = QProgressBar(self)
+        formlayout.addRow("", self.progressBar)
+        self.log = QPlainTextEdit(self)
+        self.log.setReadOnly(True)
+        formlayout.addRow("", self.log)
+
+        self.queue.progress.connect(self.showProgress)
+        self.queue.jobFailed.connect(lambda label, message: self.log.appendPlainText("{} failed: {}".format(label, message)))
+        self.queue.finished.connect(self.queueFinished)
+
+    def populate(self, selected: list[NetworkItem], mode: str):
+        self.networkList.clear()
+        for row in range(self.networkModel.rowCount()):
+            nwItem = self.networkModel.item(row)
+            if isinstance(nwItem, NetworkItem):
+                item = QListWidgetItem(nwItem.text())
+                item.setData(Qt.UserRole, nwItem)  # not the row, the model can change while the dialog is open
+                item.setCheckState(Qt.Checked if not selected or nwItem in selected else Qt.Unchecked)
+                self.networkList.addItem(item)
+        for i in range(self.modeList.count()):
+            item = self.modeList.item(i)
+            if item.data(Qt.UserRole) == mode:
+                item.setCheckState(Qt.Checked)
+
+    def browse(self):
+        directory = QFileDialog.getExistingDirectory(self, "Output Directory", self.outEdit.text())
+        if directory:
+            self.outEdit.setText(directory)
+
+    def checked(self, listWidget: QListWidget) -> list:
+        return [listWidget.item(i).data(Qt.UserRole) for i in range(listWidget.count())
+                if listWidget.item(i).checkState() == Qt.Checked]
+
+    def inModel(self, nwItem: NetworkItem) -> bool:
+        # removed rows are deleted by the model, the list keeps the dead wrapper
+        return not sip.isdeleted(nwItem) and nwItem.model() is self.networkModel
+
+    def jobs(self) -> list[tuple[str, tuple]]:
+        out = self.outEdit.text()
+        formats = [fmt for fmt, check in self.formatChecks.items() if check.isChecked()]
+        ranges = [r.strip() for r in self.rangeEdit.text().split(';') if r.strip()] or ['']
+        storeDir = self.store.directory()
+        jobs = []
+        for nwItem in self.checked(self.networkList):
+            if not self.inModel(nwItem):
+                self.log.appendPlainText("Skipped a network that was removed, populate again to see the current ones")
+                continue
+            name, f, path, z0, params = networkArgs(nwItem, storeDir)
+            for mode in self.checked(self.modeList):
+                modeFormats = [fmt for fmt in formats if fmt != 'csv' or mode not in timeModes]
+                if not modeFormats:
+                    continue
+                for rangeText in ranges:
+                    if rangeText and not rangeFits(rangeText, mode):
+                        continue  # frequency range for a time mode or the other way round
+                    label = "{} {} {}".format(name, mode, rangeText).strip()
+                    jobs.append((label, (name, f, path, z0, params, mode, rangeText, modeFormats, out, 120,
+                                         rangeTag(rangeText))))
+        return jobs
+
+    def start(self):
+        try:
+            os.makedirs(self.outEdit.text(), exist_ok=True)
+            jobs = self.jobs()
+        except OSError as e:
+            self.log.appendPlainText(str(e))
+            return
+        if not jobs:
+            self.log.appendPlainText("Nothing to export, check networks, modes, formats and ranges.")
+            return
+        self.log.appendPlainText("Queued {} jobs".format(len(jobs)))
+        self.startButton.setEnabled(False)
+        self.cancelButton.setEnabled(True)
+        self.queue.submit(jobs, [nwItem.network().s.val for nwItem in self.checked(self.networkList)
+                                 if self.inModel(nwItem)])
+
+    def showProgress(self, done: int, total: int, message: str):
+        self.progressBar.setMaximum(total)
+        self.progressBar.setValue(done)
+        if message:
+            self.log.appendPlainText(message)
+
+    def queueFinished(self):
+        self.startButton.setEnabled(True)
+        self.cancelButton.setEnabled(False)
+        self.log.appendPlainText("Done")
+
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
@@ -0,0 +1,67 @@
+import threading
+
+import numpy as npy
+from numpy.fft import fft, ifft, fftshift, ifftshift, fftfreq
+from scipy.signal import get_window
+
+from lrucache import LRUCache
+
+# names offered by TimeGatingDialog, kaiser needs a beta to be a valid scipy window
+windows = {
+    'kaiser': ('kaiser', 6),
+    'hamming': 'hamming',
+    'boxcar': 'boxcar',
+    'hann': 'hann',
+    'blackmanharris': 'blackmanharris',
+}
+
+_windows = LRUCache(64 * 1024 ** 2)
+_lock = threading.Lock()  # the gate preview computes on a worker thread
+
+
+def bandWindow(n_fd: int) -> npy.ndarray:
+    key = ('band', n_fd)
+    with _lock:
+        window_fd = _windows.get(key)
+        if window_fd is None:
+            window_fd = get_window('cosine', n_fd)
+            _windows.put(key, window_fd, window_fd.nbytes)
+    return window_fd
+
+
+def gateWindow(f: npy.ndarray, center: float, span: float, window: str) -> npy.ndarray:
+    # time-domain gate, same construction as skrf.time.time_gate(method='fft')
+    n_fd = len(f)
+    df = (f[-1] - f[0]) / (n_fd - 1)
+    key = (n_fd, df, center, span, window)
+    with _lock:
+        gate = _windows.get(key)
+        if gate is None:
+            t = fftshift(fftfreq(n_fd, df))
+            start_idx = npy.abs(t - (center - span / 2.)).argmin()
+            stop_idx = npy.abs(t - (center + span / 2.)).argmin()
+            gate = npy.zeros_like(t)
+            gate[start_idx:stop_idx + 1] = get_window(windows.get(window, window), abs(stop_idx - start_idx) + 1)
+            _windows.put(key, gate, gate.nbytes)
+    return gate
+
+
+def _shape(s: npy.ndarray):
+    return (-1,) + (1,) * (s.ndim - 1)
+
+
+def transform(f: npy.ndarray, s: npy.ndarray) -> npy.ndarray:
+    # band-pass windowed time-domain response, independent of the gate so it can be reused while tuning
+    return fftshift(ifft(s * bandWindow(len(f)).reshape(_shape(s)), axis=0), axes=0)
+
+
+def applyGate(f: npy.ndarray, s_td: npy.ndarray, center: float, span: float, window: str = 'kaiser') -> npy.ndarray:
+    shape = _shape(s_td)
+    s_td = s_td * gateWindow(f, center, span, window).reshape(shape)
+    return fft(ifftshift(s_td, axes=0), axis=0) / bandWindow(len(f)).reshape(shape)
+
+
+def timeGate(f: npy.ndarray, s: npy.ndarray, center: float, span: float, window: str = 'kaiser') -> npy.ndarray:
+    # gates every trace of an (f, ...) array with one FFT/IFFT pair along the frequency axis, times in seconds
+    return applyGate(f, transform(f, s), center, span, window)
+
@@ -0,0 +1,93 @@
+import cProfile
+import time
+from collections import deque
+
+# off by default, a disabled span costs one attribute lookup and a comparison
+enabled = False
+_requested = False  # enabled by the user, not just for a pending profile
+history = 200  # records kept for the overlay
+spans = ['load', 'parse', 'derive', 'plot', 'legend', 'redraw', 'update', 'draw', 'session', 'envelope']  # names used in the code base
+recorded = ['parse']  # only recorded after the fact, the work runs in a worker process out of cProfile's reach
+profilable = [n for n in spans if n not in recorded]
+
+_records = deque(maxlen=history)  # (name, seconds, info) in completion order
+_profileNext: dict[str, str] = {}  # span name -> .prof path, armed for the next occurrence only
+
+
+class Span:
+    __slots__ = ('name', 'info', '_start', '_profile')
+
+    def __init__(self, name: str, info: dict):
+        self.name = name
+        self.info = info
+        self._start = None  # set when timing was on at __enter__, it can be switched while the span is open
+        self._profile = None
+
+    def __enter__(self):
+        if enabled:
+            if self.name in _profileNext:
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is not None:
+            record(self.name, time.perf_counter() - self._start, **self.info)
+            if self._profile is not None:
+                self._profile.disable()
+                self._profile.dump_stats(_profileNext.pop(self.name))
+                self._profile = None
+                setEnabled(_requested)
+        return False
+
+    def set(self, **info):
+        # for values only known once the work is done, e.g. point counts
+        self.info.update(info)
+
+
+def span(name: str, **info) -> Span:
+    return Span(name, info)
+
+
+def record(name: str, seconds: float, **info):
+    if enabled:
+        _records.append((name, seconds, info))
+
+
+def records() -> list[tuple[str, float, dict]]:
+    return list(_records)
+
+
+def summary() -> dict[str, dict]:
+    # per span name: count, last/mean/max milliseconds and the info of the last occurrence
+    result = {}
+    for name, seconds, info in _records:
+        entry = result.setdefault(name, {'count': 0, 'total': 0., 'max': 0.})
+        entry['count'] += 1
+        entry['total'] += seconds * 1e3
+        entry['max'] = max(entry['max'], seconds * 1e3)
+        entry['last'] = seconds * 1e3
+        entry['info'] = info
+    for entry in result.values():
+        entry['mean'] = entry.pop('total') / entry['count']
+    return result
+
+
+def profileNext(name: str, filename: str):
+    # dump a cProfile of the next span called name, readable with pstats or snakeviz
+    global enabled
+    if name not in profilable:
+        raise ValueError("{} is not a span that can be profiled".format(name))
+    _profileNext[name] = filename
+    enabled = True
+
+
+def setEnabled(b: bool):
+    global enabled, _requested
+    _requested = b
+    enabled = b or bool(_profileNext)
+
+
+def clear():
+    _records.clear()
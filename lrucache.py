@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, budget: int):
+        self.budget = budget  # bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, nbytes: int):
+        if nbytes > self.budget:  # would evict everything else and itself
+            return
+        self.pop(key)
+        self._entries[key] = (value, nbytes)
+        self.size += nbytes
+        while self.size > self.budget:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+            return entry[0]
+        return None
+
+    def setBudget(self, budget: int):
+        self.budget = budget
+        while self.size > self.budget and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
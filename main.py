@@ -1,27 +1,62 @@
 import sys
 import platform
-import matplotlib
-from PyQt5.QtWidgets import *
 import ctypes
-from mainwindow import MainWindow
 
 myappid = u'roggenbrot42.radiolarite'  # arbitrary string
 
-if platform.system() == 'Windows':
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)  # group in taskbar
 
-matplotlib.use('Qt5Agg')
+def window(profile: bool = False):
+    if profile:
+        from startupprofile import phase
+    import matplotlib
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from mainwindow import MainWindow
+    if profile:
+        phase('imports')
 
+    if platform.system() == 'Windows':
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)  # group in taskbar
 
-def window():
+    matplotlib.use('Qt5Agg')
     app = QApplication(sys.argv)
+    if profile:
+        phase('qapp')
     win = MainWindow()
+    if profile:
+        phase('mainwindow')
     win.show()
-    if len(sys.argv) > 1:
-        filelist = sys.argv[1:]
+    if profile:
+        QTimer.singleShot(0, lambda: (phase('shown'), app.quit()))  # first event loop pass, window is painted
+        sys.exit(app.exec_())
+    import os
+    filelist = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    for directory in [arg for arg in filelist if os.path.isdir(arg)]:  # directories are watched
+        win.watchDirectory(directory)
+    filelist = [arg for arg in filelist if not os.path.isdir(arg)]
+    sessions = [arg for arg in filelist if arg.lower().endswith('.rls')]
+    if sessions:
+        win.openSession(sessions[-1])  # a session replaces the workspace, Touchstone files are added to it
+    filelist = [arg for arg in filelist if arg not in sessions]
+    if filelist:
         win.readFiles(filelist)
     sys.exit(app.exec_())
 
 
+def batch():
+    import batch
+    sys.exit(batch.main(sys.argv[1:]))
+
+
+def profileStartup():
+    import startupprofile
+    sys.exit(startupprofile.main(sys.argv[1:]))
+
+
 if __name__ == '__main__':
-    window()
+    if '--batch' in sys.argv[1:]:
+        batch()
+    elif '--profile-startup' in sys.argv[1:]:
+        profileStartup()
+    else:
+        window(profile='--startup-child' in sys.argv[1:])
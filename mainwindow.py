@@ -1,30 +1,23 @@
-from fileinput import filename
+import os
 
-import skrf.network2
-import tikzplotlib
-from PyQt5 import QtCore, QtWidgets, uic, QtGui
+from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtCore import *
 from PyQt5.QtGui import QRegularExpressionValidator
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navi
-from skrf.network import Network as Network1
-from skrf.network2 import Network
-import pandas as pd
 
-import csv
-
-import legendsettings
+# skrf, tikzplotlib and pandas are imported by the features using them, keep them out of here (see --profile-startup)
 import validatinglineedit
 from networkview import NetworkView
 from mplcanvas import MplCanvas, plotModes
 from networkitem import NetworkItem, ParamItem
+from networkloader import NetworkLoader, parseTouchstone, buildNetwork
 from validatinglineedit import ValidatingLineEdit, TimeValue, FrequencyValue
-from plugin.time_gating import TimeGatingDialog
-
-
-def network2to1(network2: skrf.network2.Network) -> skrf.Network:
-    return skrf.Network(s=network2.s.val, f=network2.frequency.f)
+import workerpool
+from instrumentation import span
+from pluginloader import PluginManager
+from ui_mainwindow import Ui_MainWindow  # pyuic5 mainwindow.ui -o ui_mainwindow.py after editing the .ui
 
 
 class DragDropEventHandler:
@@ -56,12 +49,20 @@ class DragDropEventHandler:
         return strings
 
 
-class MainWindow(QMainWindow):
+class MainWindow(QMainWindow, Ui_MainWindow):
 
     def __init__(self):
         super().__init__()
-        self.tdr_dialog = None
+        self.plugins: PluginManager = None
+        self.performance_dock = None
         self.legend_dialog = None
+        self.export_queue_dialog = None
+        self.watcher = None
+        self.watch_loader: NetworkLoader = None
+        self.tikz_tolerance: float = None  # export.tikzTolerance until changed
+        self.loader: NetworkLoader = None
+        self.progress_dialog: QProgressDialog = None
+        self.load_errors = []
         self.networkView = None
         self.canvas: MplCanvas = None
         self.title = None
@@ -74,7 +75,7 @@ class MainWindow(QMainWindow):
         self.setupMenus()
 
     def setupUI(self):
-        uic.loadUi('mainwindow.ui', self)
+        self.setupUi(self)
         self.setWindowIcon(QtGui.QIcon('Q.png'))
         self.networkView = NetworkView()
         self.networkView.setSizePolicy(QSizePolicy(QSizePolicy.Preferred,QSizePolicy.Preferred))
@@ -90,8 +91,8 @@ class MainWindow(QMainWindow):
         self.horizontalLayout_2.addWidget(self.canvas)
         self.setupPlotSelectorBox()
         self.setupRangeEdits()
-        self.legend_dialog = legendsettings.LegendSettingsDialog(None)
-        self.tdr_dialog = TimeGatingDialog(parent=None)
+        self.plugins = PluginManager(self, self.menuMath)
+        self.loader = NetworkLoader(self)
 
     def setupModels(self):
         self.networkModel = QtGui.QStandardItemModel()
@@ -103,7 +104,7 @@ class MainWindow(QMainWindow):
         self.canvas.setSelectionModel(self.selectionModel)
         self.networkView.setModel(self.networkModel)
         self.networkView.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.networkView.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.networkView.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.networkView.setSelectionModel(self.selectionModel)
         #self.networkView.setContextMenuPolicy(Qt.CustomContextMenu)
         self.networkView.setAnimated(True)
@@ -111,17 +112,31 @@ class MainWindow(QMainWindow):
     def setupMenus(self):
         self.actionNew.triggered.connect(self.reset)
         self.actionOpenTouchstoneFile.triggered.connect(self.openFileDialog)
+        self.actionOpenSession.triggered.connect(self.openSessionDialog)
+        self.actionSaveSession.triggered.connect(self.saveSessionDialog)
+        self.actionWatchDirectory.triggered.connect(self.watchDirectoryDialog)
+        self.actionStopWatching.triggered.connect(self.stopWatching)
         self.actionExportFigure.triggered.connect(self.exportFigure)
-        self.actionExportCSV.triggered.connect(self.exportCSV)
+        self.actionTikzTolerance.triggered.connect(self.setTikzTolerance)
+        self.actionExportCSV.triggered.connect(self.exportData)
+        self.actionExportQueue.triggered.connect(self.showExportQueue)
         self.plotSelectorBox.currentIndexChanged.connect(self.canvas.changePlotMode)
         self.plotSelectorBox.currentIndexChanged.connect(self.changePlotMode)
         self.actionGridMajor.toggled.connect(self.canvas.toggleMajorGrid)
         self.actionGridMinor.toggled.connect(self.canvas.toggleMinorGrid)
         self.actionCopy_to_clipboard.triggered.connect(self.copyToClipboard)
-        self.actionTime_Domain_Gating.triggered.connect(self.triggerTDGating)
-        self.actionLegend.triggered.connect(self.legend_dialog.show)
-        self.legend_dialog.columnsChanged.connect(self.canvas.legendChange)
-        self.tdr_dialog.resultChanged.connect(self.tdrGateNetwork)
+        self.actionMemoryMap.toggled.connect(self.toggleMemoryMap)
+        self.actionLegend.triggered.connect(self.showLegendDialog)
+        self.actionEnvelope.toggled.connect(self.toggleEnvelope)
+        self.actionEnvelopeBand.triggered.connect(self.setEnvelopeBand)
+        self.actionDataCursor.toggled.connect(self.canvas.setCursorEnabled)
+        self.actionPerformance.toggled.connect(self.togglePerformanceDock)
+        self.actionProfileOperation.triggered.connect(self.profileOperation)
+        self.loader.networkLoaded.connect(self.networkLoaded)
+        self.loader.loadFailed.connect(self.networkLoadFailed)
+        self.loader.progress.connect(self.loadProgress)
+        self.loader.finished.connect(self.loadFinished)
+        self.plugins.discover()
 
     def setupPlotSelectorBox(self):
         keys = list(plotModes.keys())
@@ -148,6 +163,7 @@ class MainWindow(QMainWindow):
         row_count = self.networkModel.rowCount()
         self.networkModel.invisibleRootItem().removeRows(0, row_count)
         self.canvas.reset()
+        self.actionEnvelope.setChecked(False)
 
     def getPlotModeType(self):
         index = self.plotSelectorBox.currentIndex()
@@ -186,11 +202,11 @@ class MainWindow(QMainWindow):
         unitl = list()
 
         if self.getPlotModeType() == 'frequency':
-            units = {'Hz': 1e-9, 'kHz': 1e-6, 'MHz': 1e-3, 'GHz': 1, 'THz': 1e3}
+            units = {'Hz': 1, 'kHz': 1e3, 'MHz': 1e6, 'GHz': 1e9, 'THz': 1e12}
 
             for string in range_strs:
                 if string == '':
-                    self.canvas.setXlimits('', '')
+                    self.canvas.setXlimits()
                     return
                 unit = 'GHz'  # default unit
                 tok = string.split(" ")
@@ -204,7 +220,7 @@ class MainWindow(QMainWindow):
 
             for string in range_strs:
                 if string == '':
-                    self.canvas.setXlimits('', '')
+                    self.canvas.setXlimits()
                     return
                 unit = 'ns'  # default unit
                 tok = string.split(" ")
@@ -224,56 +240,230 @@ class MainWindow(QMainWindow):
             self.startFrequencyEdit.setText(ranges[0])
             self.stopFrequencyEdit.setText(ranges[1])
 
-        if self.getPlotModeType() == 'frequency':
-            self.canvas.setXlimits(ranges[0], ranges[1] + unit.lower())
-        else:
-            self.canvas.setXlimits(float(ranges[0]) * unitl[0], float(ranges[1]) * unitl[1])
+        # Hz for frequency, ns for time modes
+        self.canvas.setXlimits(float(ranges[0]) * unitl[0], float(ranges[1]) * unitl[1])
 
     def openFileDialog(self):
-        filename = QFileDialog.getOpenFileName(filter="Touchstone Files (*.s1p *.s2p *.s3p *.s4p)")[0]
+        filenames = QFileDialog.getOpenFileNames(filter="Touchstone Files (*.s1p *.s2p *.s3p *.s4p)")[0]
+        if filenames:
+            self.readFiles(filenames)
+
+    def openSessionDialog(self):
+        from session import sessionFilter
+        filename = QFileDialog.getOpenFileName(filter=sessionFilter)[0]
         if filename:
-            filenames = list()
-            filenames.append(filename)
-            self.readFile(filename)
+            self.openSession(filename)
+
+    def saveSessionDialog(self):
+        from session import sessionFilter, sessionExtension
+        filename = QFileDialog.getSaveFileName(caption="Save Session", filter=sessionFilter)[0]
+        if not filename:
+            return
+        if not os.path.splitext(filename)[1]:
+            filename += sessionExtension
+        items = [self.networkModel.item(row) for row in range(self.networkModel.rowCount())
+                 if isinstance(self.networkModel.item(row), NetworkItem)]
+        state = {'mode': self.canvas.plotMode,
+                 'range': [self.startFrequencyEdit.text(), self.stopFrequencyEdit.text()],
+                 'legendColumns': self.canvas.legendColumns,
+                 'gridMajor': self.actionGridMajor.isChecked(),
+                 'gridMinor': self.actionGridMinor.isChecked()}
+        from session import saveSession
+        try:
+            with span('session', file=os.path.basename(filename)):
+                saveSession(filename, items, state)
+        except (ValueError, OSError) as e:
+            QMessageBox().critical(self, "Session Error", str(e))
+
+    def openSession(self, filename: str):
+        # replaces the workspace, the arrays are mapped from the session file instead of parsed again
+        from session import loadSession
+        try:
+            with span('session', file=os.path.basename(filename)):
+                state, networks = loadSession(filename)
+        except (ValueError, OSError) as e:
+            QMessageBox().critical(self, "Session Error", str(e))
+            return
+        self.reset()
+        modes = list(plotModes.values())
+        if state.get('mode') in modes:
+            self.plotSelectorBox.setCurrentIndex(modes.index(state['mode']))
+        self.actionGridMajor.setChecked(state.get('gridMajor', self.actionGridMajor.isChecked()))
+        self.actionGridMinor.setChecked(state.get('gridMinor', self.actionGridMinor.isChecked()))
+        columns = state.get('legendColumns', 1)
+        self.canvas.legendColumns = columns
+        if self.legend_dialog is not None:
+            self.legend_dialog.columnedit.setText(str(columns))
+        start, stop = state.get('range', ['', ''])
+        self.startFrequencyEdit.setText(start)
+        self.stopFrequencyEdit.setText(stop)
+        self.rangeChanged()
+        root = self.networkModel.invisibleRootItem()
+        for nw, source, enabled in networks:
+            nwItem = NetworkItem(nw)
+            nwItem.filename = source
+            for p in nwItem.params():
+                p.setCheckState(Qt.Checked if (p.m, p.n) in enabled else Qt.Unchecked)
+            root.appendRow(nwItem)  # checked before insertion, each network is plotted once
+        self.networkView.expandAll()
+        self.title = os.path.splitext(os.path.basename(filename))[0]
+
+    def watchDirectoryDialog(self):
+        directory = QFileDialog.getExistingDirectory(self, "Watch Directory")
+        if directory:
+            self.watchDirectory(directory)
+
+    def watchDirectory(self, directory: str):
+        # new and modified Touchstone files are loaded in the background while measuring
+        if self.watcher is None:
+            from directorywatcher import DirectoryWatcher
+            self.watcher = DirectoryWatcher(self)
+            self.watch_loader = NetworkLoader(self, store=self.loader.store)  # no progress dialog
+            self.watcher.filesChanged.connect(self.watch_loader.load)
+            self.watch_loader.networkLoaded.connect(self.watchedFileLoaded)
+            # no message box in the middle of a measurement, a half written file is retried on its next change
+            self.watch_loader.loadFailed.connect(lambda filename, message: print(filename, message))
+        self.watcher.watch(directory)
+        self.actionStopWatching.setEnabled(True)
+
+    def stopWatching(self):
+        if self.watcher is not None:
+            self.watcher.unwatch()
+            self.watch_loader.cancel()
+        self.actionStopWatching.setEnabled(False)
+
+    def watchedFileLoaded(self, filename: str, data: tuple):
+        # a file seen before replaces the data of its network, only those traces are redrawn
+        with span('load', file=os.path.basename(filename)):
+            nw = buildNetwork(*data)
+            item = self.findNetworkItem(filename)
+            if item is None:
+                self.addNetwork(nw, filename)
+            elif item.network().nports != nw.nports:
+                self.networkModel.removeRow(item.row())
+                self.addNetwork(nw, filename)
+            else:
+                nw.name = item.network().name  # keep a rename
+                item.setNetwork(nw)
+                self.loader.store.track(nw.s.val)
+
+    def findNetworkItem(self, filename: str) -> NetworkItem:
+        filename = os.path.abspath(filename)
+        for row in range(self.networkModel.rowCount()):
+            item = self.networkModel.item(row)
+            if isinstance(item, NetworkItem) and item.filename == filename:
+                return item
+        return None
 
     def exportFigure(self):
         if not self.canvas:
             return
         filename = QFileDialog.getSaveFileName(filter="LaTex Files (*.tex)")[0]
         if filename:
-            tikzplotlib.clean_figure(
-                self.canvas.figure)  # crops invisible points and elements, not reversible maybe copy
-            code = tikzplotlib.get_tikz_code(figure=self.canvas.figure, filepath=filename, standalone=True)
-            f = open(filename, "w", encoding='utf8')
-            f.write(code)
-            f.close()
-
-    def exportCSV(self):
-        if not self.canvas:
+            from export import writeTikz
+            writeTikz(self.canvas.figure, filename, self.tikz_tolerance, self.actionTikzExternal.isChecked(),
+                      self.canvas._fulldata)
+
+    def setTikzTolerance(self):
+        from export import tikzTolerance
+        tolerance, ok = QInputDialog.getDouble(self, "TikZ Point Reduction",
+                                               "Allowed curve deviation in pt (0 keeps every point)",
+                                               tikzTolerance if self.tikz_tolerance is None else self.tikz_tolerance, 0., 10., 2)
+        if ok:
+            self.tikz_tolerance = tolerance
+
+    def exportData(self):
+        # selected networks, or all of them when nothing is selected
+        networks = [item.network() for item in self.getSelectedNetworkItems()]
+        if not networks:
+            networks = [self.networkModel.item(row).network() for row in range(self.networkModel.rowCount())
+                        if isinstance(self.networkModel.item(row), NetworkItem)]
+        if not networks:
+            QMessageBox().critical(self, "Error", "No Network loaded")
             return
-        currentNetwork = self.getCurrentNetwork()
-        if currentNetwork:
-            filenames = QFileDialog.getSaveFileName(caption="Save to CSV", directory=currentNetwork.name,
-                                                    filter="CSV files (*.csv)")
-            if not filenames or len(filenames) < 2 or filenames[0] == '':
-                return
-            nw1 = skrf.Network(name=currentNetwork.name, s=currentNetwork.s.val, f=currentNetwork.frequency.f_scaled,
-                               f_unit=currentNetwork.frequency.unit)
-            index = self.plotSelectorBox.currentIndex()
-            plot_mode = list(plotModes.values())[index]
-            attr = "s_{}".format(plot_mode)
-            try:
-                dataframe = nw1.to_dataframe(attrs=[attr])
-            except AttributeError as e:
-                QMessageBox().critical(self, "Error", "Attribute Error {}.".format(e))
-                return
-            dataframe.index.name = 'Frequency ({})'.format(currentNetwork.frequency.unit)
-            try:
-                dataframe.to_csv(filenames[0], sep=' ')  # quoting=csv.QUOTE_NONE, escapechar="\\")
-            except ValueError as e:
-                print(e)
+        from export import dataFormats, exportNetworks
+        if len(networks) == 1:
+            caption, directory = "Export Data", networks[0].name
         else:
-            QMessageBox().critical(self, "Error", "No Network selected")
+            caption, directory = "Export {} Networks (named after each network)".format(len(networks)), "networks"
+        filename, selected = QFileDialog.getSaveFileName(caption=caption, directory=directory,
+                                                         filter=";;".join(dataFormats.keys()))
+        if not filename:
+            return
+        if not os.path.splitext(filename)[1]:
+            filename += dataFormats.get(selected, '.csv')
+        plot_mode = list(plotModes.values())[self.plotSelectorBox.currentIndex()]
+        try:
+            written = exportNetworks(networks, plot_mode, filename)
+        except (ValueError, OSError) as e:
+            QMessageBox().critical(self, "Export Error", str(e))
+            return
+        print("exported", ', '.join(written))
+
+    def showExportQueue(self):
+        if self.export_queue_dialog is None:
+            from exportqueue import ExportQueueDialog
+            self.export_queue_dialog = ExportQueueDialog(self.networkModel, self.loader.store, plotModes)
+        plot_mode = list(plotModes.values())[self.plotSelectorBox.currentIndex()]
+        self.export_queue_dialog.populate(self.getSelectedNetworkItems(), plot_mode)
+        self.export_queue_dialog.show()
+
+    def showLegendDialog(self):
+        if self.legend_dialog is None:
+            import legendsettings
+            self.legend_dialog = legendsettings.LegendSettingsDialog(None)
+            self.legend_dialog.columnsChanged.connect(self.canvas.legendChange)
+        self.legend_dialog.show()
+
+    def toggleEnvelope(self, b: bool):
+        if not b:
+            self.canvas.clearEnvelope()
+            return
+        # selected networks, or all of them when nothing is selected
+        items = self.getSelectedNetworkItems()
+        if not items:
+            items = [self.networkModel.item(row) for row in range(self.networkModel.rowCount())
+                     if isinstance(self.networkModel.item(row), NetworkItem)]
+        try:
+            if len(items) < 2:
+                raise ValueError("An envelope needs at least two networks")
+            self.canvas.showEnvelope(items)
+        except ValueError as e:
+            QMessageBox().critical(self, "Envelope Error", str(e))
+            self.actionEnvelope.setChecked(False)
+
+    def setEnvelopeBand(self):
+        from envelope import bands
+        names = list(bands.keys())
+        current = list(bands.values()).index(self.canvas.envelopePercentiles)
+        name, ok = QInputDialog.getItem(self, "Envelope Band", "Outer band", names, current, False)
+        if ok:
+            self.canvas.setEnvelopePercentiles(bands[name])
+
+    def togglePerformanceDock(self, b: bool):
+        import instrumentation
+        instrumentation.setEnabled(b)
+        if self.performance_dock is None:
+            if not b:
+                return
+            from performancedock import PerformanceDock
+            self.performance_dock = PerformanceDock(self, self.networkModel)
+            self.performance_dock.closed.connect(lambda: self.actionPerformance.setChecked(False))
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.performance_dock)
+        self.performance_dock.setVisible(b)
+
+    def profileOperation(self):
+        import instrumentation
+        name, ok = QInputDialog.getItem(self, "Profile Next Operation", "Operation", instrumentation.profilable, 0, False)
+        if not ok:
+            return
+        filename = QFileDialog.getSaveFileName(caption="Save Profile", directory=name + '.prof',
+                                               filter="cProfile Stats (*.prof)")[0]
+        if filename:
+            instrumentation.profileNext(name, filename)
+
+    def toggleMemoryMap(self, b: bool):
+        self.loader.store.enabled = b
 
     def copyToClipboard(self):
         pixmap = self.canvas.grab()
@@ -295,63 +485,81 @@ class MainWindow(QMainWindow):
                 network = network_item.network()
         return network_item
 
-    def getCurrentNetwork(self) -> Network:
+    def getCurrentNetwork(self):
         nwIt = self.getCurrentNetworkItem()
         if nwIt:
             return nwIt.network()
         else:
             return None
 
-    def triggerTDGating(self):
-        network_item = self.getCurrentNetworkItem()
-        if network_item is None:
-            QMessageBox().critical(self, "Error", "No Network selected")
-            return
-        # self.tdr_dialog.resize(480, 320)
-        self.tdr_dialog.show()
-
-    def tdrGateNetwork(self, tmp: dict):
-        t_center = tmp['center']
-        t_span = tmp['span']
-        window = tmp['window'].lower()
-        nw = self.getCurrentNetworkItem().network()
-        nwl = list()
-        for pt in nw.port_tuples:
-            network = skrf.Network(s=nw.s[:, pt[0], pt[1]], f=nw.frequency.f_scaled)
-            try:
-                gated_network = network.s11.time_gate(center=t_center.num, span=t_span.num, window=window)
-            except ValueError:
-                QMessageBox().critical(self, "Window not supported", "Window not yet supported, pick another one.")
-                return
-
-            gated_network.name = nw.name + ' (gated)'
-            nwl.append(gated_network)
-        combined_network = skrf.network.n_oneports_2_nport(nwl, name=nw.name + ' (gated)')
-        nw2 = Network.from_ntwkv1(combined_network)
-        nw2.frequency.unit = 'GHz'
-        nwItem = NetworkItem(nw2)
-        self.networkModel.invisibleRootItem().appendRow(nwItem)
+    def getSelectedNetworkItems(self) -> list[NetworkItem]:
+        items = list()
+        for index in self.selectionModel.selectedIndexes():
+            item = self.networkModel.itemFromIndex(index)
+            if isinstance(item, ParamItem):
+                item = item.parent()
+            if isinstance(item, NetworkItem) and item not in items:
+                items.append(item)
+        return items
 
-    def readFile(self, filename):
-        import os
+    def addNetwork(self, nw, filename: str):
         baseName = os.path.basename(filename)
         self.title = os.path.splitext(baseName)[0]
         print('FILE', self.title)
 
-        nw = Network.from_ntwkv1(Network1(filename))
-        nw.frequency.unit = 'ghz'  # fix for https://github.com/scikit-rf/scikit-rf/issues/293
         root = self.networkModel.invisibleRootItem()
         nwItem = NetworkItem(nw)
+        nwItem.filename = os.path.abspath(filename)
+        self.loader.store.track(nw.s.val)  # a removed or reloaded network takes its store file with it
         root.appendRow(nwItem)
         self.networkView.expandAll()
 
+    def readFile(self, filename):
+        storeDir, mapThreshold = self.loader.store.workerArgs()
+        with span('load', file=os.path.basename(filename)):
+            self.addNetwork(buildNetwork(*parseTouchstone(filename, storeDir, mapThreshold)), filename)
+
     def readFiles(self, strings):
-        try:
-            for filename in strings:
-                self.readFile(filename)
-        except Exception as e:
-            print(e)
-            QtWidgets.QMessageBox().critical(self, "Critical Error", str(e))
+        if not strings:
+            return
+        if self.progress_dialog is None:
+            self.progress_dialog = QProgressDialog("Loading Touchstone files...", "Cancel", 0, 0, self)
+            self.progress_dialog.setWindowTitle("Loading")
+            self.progress_dialog.setMinimumDuration(500)  # don't flash for a handful of small files
+            self.progress_dialog.setAutoReset(False)
+            self.progress_dialog.canceled.connect(self.loader.cancel)
+        self.loader.load(strings)
+
+    def networkLoaded(self, filename: str, data: tuple):
+        with span('load', file=os.path.basename(filename)):
+            self.addNetwork(buildNetwork(*data), filename)
+
+    def networkLoadFailed(self, filename: str, message: str):
+        print(filename, message)
+        self.load_errors.append("{}: {}".format(filename, message))
+
+    def loadProgress(self, done: int, total: int, filename: str):
+        self.progress_dialog.setMaximum(total)
+        self.progress_dialog.setValue(done)
+        if filename:
+            self.progress_dialog.setLabelText("Loaded {} ({}/{})".format(filename, done, total))
+
+    def loadFinished(self):
+        self.progress_dialog.reset()
+        if self.load_errors:
+            QtWidgets.QMessageBox().critical(self, "Critical Error", "\n".join(self.load_errors))
+            self.load_errors = []
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        if self.export_queue_dialog is not None:
+            self.export_queue_dialog.queue.cancel()
+            self.export_queue_dialog.close()
+        if self.watch_loader is not None:
+            self.watch_loader.cancel()
+        self.loader.shutdown()
+        self.plugins.shutdown()
+        workerpool.shutdown()
+        super().closeEvent(event)
 
     def dragEnterEvent(self, e):
         DragDropEventHandler.dragEnterEvent(e)
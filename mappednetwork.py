@@ -0,0 +1,32 @@
+import numpy as npy
+import skrf
+from skrf.network2 import Network, S, Parameter
+
+from networkstore import openArray
+
+
+class MappedS(S):
+    def __init__(self, network, s):
+        # S() would pull the whole array into RAM through npy.array(s, dtype=complex)
+        Parameter.__init__(self, network)
+        self._val = s
+
+
+class MappedNetwork(Network):
+    def _setS(self, s):
+        if isinstance(s, npy.memmap):
+            self._s = MappedS(self, s)
+        else:
+            Network.s.fset(self, s)
+
+    s = property(Network.s.fget, _setS)
+
+
+def mappedNetwork(name, f, s: npy.memmap, z0) -> MappedNetwork:
+    nw = MappedNetwork(frequency=skrf.Frequency.from_f(f, unit='hz'), s=s, z0=z0, name=name)
+    nw.frequency.unit = 'ghz'
+    return nw
+
+
+def openNetwork(name, f, path, z0) -> MappedNetwork:
+    return mappedNetwork(name, f, openArray(path), z0)
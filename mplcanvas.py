@@ -1,20 +1,25 @@
 from collections import OrderedDict
 
 import matplotlib
-import openpyxl.drawing.image
+import numpy as npy
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 from matplotlib import axes
+from matplotlib.collections import PolyCollection
 from matplotlib.backend_bases import MouseButton
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
-from skrf.network2 import Network as SkNetwork
-import skrf
-from skrf.plotting import *
 
+import instrumentation
+from datacursor import DataCursor
+from decimation import decimateRectangular, decimateParametric, decimateBand
+from envelope import envelope, envelopeModes, commonParams, disjoint
+from instrumentation import span
 from networkitem import NetworkItem, ParamItem
+from smithchart import SmithBackground, smithAxes, backgroundGid
+from tracedata import deriveTrace, plotTrace, traceLabel, timeModes, axisLabels
 from validatinglineedit import TimeValue
 
 plotModes = OrderedDict((
@@ -42,20 +47,50 @@ class MplCanvas(FigureCanvasQTAgg):
         fig.canvas.mpl_connect('button_press_event', self.button_press_event)
         fig.canvas.mpl_connect('button_release_event', self.button_release_event)
         fig.canvas.mpl_connect('key_press_event', self.key_event)
+        fig.canvas.mpl_connect('resize_event', self.on_resize)
+        fig.canvas.mpl_connect('draw_event', self.on_draw)
+        fig.canvas.mpl_connect('motion_notify_event', self.motion_event)
+        fig.canvas.mpl_connect('axes_leave_event', self.axes_leave_event)
         self.networkModel: QStandardItemModel = None
         self.selectionModel = None
         self.default_linewidth = 1.5  # don't change or it won't match with mpl default and glitch ---
         self.picked: matplotlib.lines.Line2D = None  # type: Line2D #always the line, never legend
         self.pickstate = 0
+        self._background = None  # figure without the highlight, captured on every full draw
+        self._highlighted = None  # (picked trace, figure with its highlight), the cursor moves over this
         self.line2leg = {}
-        self.trace2param = {}
+        self.trace2param: dict[Line2D, ParamItem] = {}  # every pooled trace in legend order, ParamItem.getTrace is the reverse
+        self._stale = set()  # hidden traces whose data predates the last range change
+        self._revision: dict[Line2D, int] = {}  # NetworkItem.revision the trace data was derived from
+        self.legendColumns = 1
         self.plotMode = 'db'
         self.gridMajor = gridMajor
         self.gridMinor = gridMinor
+        self._fulldata: dict[Line2D, tuple] = {}  # undecimated x, y and whether the trace is parametric
+        self.detailThreshold = 2000  # points, shorter traces are never decimated
+        self.connectAxes()
         self.grid()
         self.figure.tight_layout()
-        self._lines = []
-        self.xlimits = ['', '']
+        self._previews: list[tuple[NetworkItem, NetworkItem]] = []  # (source, gated preview) pairs
+        self._previewLines: list[Line2D] = []
+        self._envelope: list[NetworkItem] = []  # networks shown as one statistical envelope instead of traces
+        self.envelopePercentiles: tuple[float, float] = None  # band, min/max if None
+        self._envelopeLines: list[Line2D] = []  # mean lines, in the legend but not pickable
+        self._bands: dict[PolyCollection, tuple] = {}  # band -> full resolution x, lo, hi
+        self.xlimits: tuple[float, float] = None  # Hz in frequency modes, ns in time modes
+        self._windows: dict[int, tuple[NetworkItem, int, slice]] = {}  # per redraw: id -> item, revision, window
+        self._smith = SmithBackground()
+        self._smithImage: matplotlib.image.AxesImage = None
+        self._smithKey = None  # what the image currently shows
+        self.cursor = DataCursor(self)
+
+    def draw(self):
+        with span('draw') as s:
+            if self._smithImage is not None:
+                self.updateSmithBackground()
+            super().draw()
+            if instrumentation.enabled:
+                s.set(points=sum(len(line.get_xdata()) for line in self.axes().lines if line.get_visible()))
 
     def axes(self):
         ax = self.figure.get_axes()
@@ -65,21 +100,39 @@ class MplCanvas(FigureCanvasQTAgg):
             return ax
 
     def reset(self):
+        self._envelope = []
+        self.clearAxes()
+        for p in self.trace2param.values():
+            p.setTrace(None)
+        self.trace2param = {}
+        self._fulldata = {}
+        self._stale = set()
+        self._revision = {}
+        self.draw_idle()
+
+    def clearAxes(self):
+        # fresh axes, pooled traces are detached but stay registered with their ParamItems
         for ax in self.figure.get_axes():
             ax.clear()
         self.figure.clf(keep_observers=False)
         self.figure.subplots()
-        self.trace2param = {}
+        self.connectAxes()
+        self._previewLines = []
+        for line in self._envelopeLines:
+            self._fulldata.pop(line, None)
+        self._envelopeLines = []
+        self._bands = {}
+        self._smithImage = None
         self.pickstate = 0
-        self._lines = []
         self.picked = None
+        self._background = None
+        self._highlighted = None
         self.grid()
-        self.draw_idle()
 
     def setModel(self, networkModel: QStandardItemModel):
         if isinstance(networkModel, QStandardItemModel):
             self.networkModel = networkModel
-            self.networkModel.itemChanged.connect(self.redrawAll)
+            self.networkModel.itemChanged.connect(self.itemChanged)
             self.networkModel.rowsInserted.connect(self.addTraces)
             self.networkModel.rowsAboutToBeRemoved.connect(self.removeTrace)
             self.networkModel.modelReset.connect(self.reset)
@@ -96,105 +149,426 @@ class MplCanvas(FigureCanvasQTAgg):
     def addTraces(self, parent: QModelIndex, first: int, last: int):
         nwItem = self.networkModel.itemFromIndex(self.networkModel.index(first, 0))
         if isinstance(nwItem, NetworkItem):  # this contains a network
-            nw = nwItem.network()
             parm = nwItem.enabledParams()
             for p in parm:
-                ax = self.figure.axes[0]
-                traces = self.plotNetwork(nw, p.toTuple())
-                if traces and len(traces) > 0:
-                    self.trace2param[traces[0]] = p
+                self.plotParam(p)
             self.generate_line_to_legend()
             self.draw_idle()
 
     def removeTrace(self, parent: QModelIndex, first: int, last: int):
         for row in range(first, last + 1):
-            idx = self.networkModel.index(row, 0)
+            idx = self.networkModel.index(row, 0, parent)
             item = self.networkModel.itemFromIndex(idx)
             if type(item) == ParamItem:
-                item = item.parent()
-            params = item.enabledParams()
-            for trace in self.trace2param.keys():
-                if self.trace2param[trace] in params:
-                    trace.remove()
-                    if trace == self.picked:
-                        self.pickstate = 0
-                        self.picked = None
+                params = [item]
+            else:
+                params = item.params()
+                self._windows.pop(id(item), None)  # would keep the network and its mapped store file alive
+                if any(source is item for source, _ in self._previews):
+                    self.clearPreview()
+                if self.inEnvelope(item):
+                    self._envelope = [nwItem for nwItem in self._envelope if nwItem is not item]
+                    self.refreshEnvelope()
+            for p in params:
+                self.dropTrace(p)
         self.generate_line_to_legend()
         self.draw_idle()
 
-    def redrawAll(self):
-        self.reset()
-        if self.plotMode == 'smith':
-            smith(ax=self.axes(), draw_labels=True, draw_vswr=True)
+    def dropTrace(self, p: ParamItem):
+        trace = p.getTrace()
+        if trace is None:
+            return
+        if trace.axes is not None:
+            trace.remove()
+        self.trace2param.pop(trace, None)
+        self._fulldata.pop(trace, None)
+        self._stale.discard(trace)
+        self._revision.pop(trace, None)
+        p.setTrace(None)
+        if trace is self.picked:
+            self.pickstate = 0
+            self.picked = None
+
+    def itemChanged(self, item: QStandardItem):
+        # only check state (ParamItem) and name (NetworkItem) can change, neither needs new data
+        if isinstance(item, ParamItem):
+            self.toggleParam(item)
+        elif isinstance(item, NetworkItem):
+            self.networkChanged(item)
         else:
-            self.grid()
-        for i in range(self.networkModel.rowCount()):
-            idx = self.networkModel.index(i, 0)
-            ntwk: NetworkItem = self.networkModel.itemFromIndex(idx)
-            if isinstance(ntwk, NetworkItem):
-                for p in ntwk.enabledParams():
-                    traces = self.plotNetwork(ntwk.network(), p.toTuple())
-                    if traces and len(traces) > 0:
-                        self.trace2param[traces[0]] = p
-        if self.xlimits[1] != '' and self.plotMode in ['z_time', 's_time']:
-            self.axes().set_xlim(float(self.xlimits[0]), float(self.xlimits[1]))
-        self.figure.tight_layout()
+            self.redrawAll()
+
+    def toggleParam(self, p: ParamItem):
+        if self.envelopeActive() and self.inEnvelope(p.parent()):
+            self.refreshEnvelope()
+            self.generate_line_to_legend()
+            self.draw_idle()
+            return
+        trace = p.getTrace()
+        if p.checkState():
+            if trace is None:
+                self.plotParam(p)
+            else:
+                if trace in self._stale:
+                    self.updateTrace(trace)
+                trace.set_visible(True)
+        elif trace is not None:
+            trace.set_visible(False)
+            if trace is self.picked:
+                self.pickLine(None)
+        self.generate_line_to_legend()
+        self.draw_idle()
+
+    def networkChanged(self, nwItem: NetworkItem):
+        if self.envelopeActive() and self.inEnvelope(nwItem):
+            self.refreshEnvelope()
+            self.generate_line_to_legend()
+            self.draw_idle()
+            return
+        name = nwItem.network().name
+        replaced = False
+        for p in nwItem.params():
+            trace = p.getTrace()
+            if trace is not None:
+                trace.set_label(traceLabel(name, p.m, p.n))
+                if self._revision.get(trace) != nwItem.revision:  # new data, not just a rename
+                    replaced = True
+                    if trace.get_visible():
+                        self.updateTrace(trace)
+                    else:
+                        self._stale.add(trace)
+        if replaced:
+            self.relim(self.axes())
+            self.axes().autoscale_view()
         self.generate_line_to_legend()
         self.draw_idle()
 
-    def plotNetwork(self, network: SkNetwork, param: tuple[int, int] = None):
+    def redrawAll(self):
+        # existing traces get new data and move to the new axes, only missing ones are created
+        with span('redraw', mode=self.plotMode):
+            self._windows = {}
+            pool = self.trace2param
+            self.trace2param = {}
+            self.clearAxes()
+            ax = self.axes()
+            if self.plotMode == 'smith':
+                self.drawSmithBackground(ax)
+            first = None
+            envelopeActive = self.envelopeActive()
+            for i in range(self.networkModel.rowCount()):
+                idx = self.networkModel.index(i, 0)
+                ntwk: NetworkItem = self.networkModel.itemFromIndex(idx)
+                if isinstance(ntwk, NetworkItem):
+                    if first is None:
+                        first = ntwk
+                    if envelopeActive and self.inEnvelope(ntwk):
+                        continue  # its traces are dropped below, the envelope stands in for them
+                    for p in ntwk.params():
+                        trace = p.getTrace()
+                        if trace is not None:
+                            self.adoptTrace(ax, trace, p)
+                        elif p.checkState():
+                            self.plotParam(p)
+            for trace, p in pool.items():  # not in the model anymore
+                if trace not in self.trace2param:
+                    self.trace2param[trace] = p
+                    self.dropTrace(p)
+            if first is not None and self.plotMode != 'smith':
+                x_label, y_label = axisLabels(self.plotMode, first)
+                ax.set_xlabel(x_label)
+                ax.set_ylabel(y_label)
+                ax.autoscale(True, 'x', True)
+            self.plotEnvelope()
+            self.relim(ax)
+            ax.autoscale_view()
+            self.plotPreview()
+            if self.xlimits is not None and self.plotMode in timeModes:
+                self.axes().set_xlim(*self.xlimits)
+            self.figure.tight_layout()
+            self.generate_line_to_legend()
+            self.draw_idle()
+
+    def figureKey(self):
+        return tuple(self.figure.get_size_inches()), self.figure.dpi
+
+    def drawSmithBackground(self, ax: matplotlib.axes.Axes):
+        # the chart is an image, rendered again in draw() when the size or the view changed
+        size, dpi = self.figureKey()
+        xlim, ylim = self._smith.limits(size, dpi)
+        smithAxes(ax)
+        self._smithImage = ax.imshow(npy.zeros((1, 1, 4)), extent=(*xlim, *ylim), origin='upper', zorder=0,
+                                     interpolation='nearest', gid=backgroundGid)
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        self._smithKey = None
+
+    def updateSmithBackground(self):
+        ax = self._smithImage.axes
+        size, dpi = self.figureKey()
+        key = (size, dpi, tuple(ax.get_position(original=True).bounds), ax.get_xlim(), ax.get_ylim())
+        if key != self._smithKey:
+            self._smithImage.set_data(self._smith.render(*key))
+            self._smithImage.set_extent((*key[3], *key[4]))
+            self._smithKey = key
+
+    def adoptTrace(self, ax: matplotlib.axes.Axes, trace: Line2D, p: ParamItem):
+        self.trace2param[trace] = p
+        if trace.get_visible():
+            self.updateTrace(trace)
+        else:
+            self._stale.add(trace)
+            self._fulldata.pop(trace, None)
+        trace.set_transform(ax.transData)
+        trace.set_clip_path(ax.patch)
+        ax.add_line(trace)
+
+    def frequencyWindow(self, nwItem: NetworkItem):
+        # binary search once per network and redraw, all of its parameters share the slice
+        if self.xlimits is None or self.plotMode in timeModes:
+            return None
+        cached = self._windows.get(id(nwItem))
+        if cached is None or cached[0] is not nwItem or cached[1] != nwItem.revision:
+            cached = nwItem, nwItem.revision, nwItem.window(*self.xlimits)
+            self._windows[id(nwItem)] = cached
+        return cached[2]
+
+    def plotParam(self, p: ParamItem):
+        traces = self.plotNetwork(p.parent(), p.toTuple())
+        if traces and len(traces) > 0:
+            self.trace2param[traces[0]] = p
+            self._revision[traces[0]] = p.parent().revision
+            p.setTrace(traces[0])
+
+    def plotNetwork(self, nwItem: NetworkItem, param: tuple[int, int]):
         ax = self.axes()
-        if isinstance(network, SkNetwork):
+        if isinstance(nwItem, NetworkItem):
+            m, n = param
             pm = self.plotMode
-            if pm == 's_time':
-                prm = network.s_time
-                if param is None:
-                    lines = prm.db.plot(ax=self.axes(), picker=5)
-                else:
-                    lines = prm.db.plot(m=param[0], n=param[1], ax=self.axes(), picker=5)
-            elif pm == 'z_time':
-                nw1 = skrf.Network(s=network.s.val, f=network.frequency.f)
-                nw1 = nw1.extrapolate_to_dc(kind='linear')
-                lines = nw1.s11.plot_z_time_step(window='hamming', ax=self.axes(), picker=5, label=network.name)
-            else:
-                if self.xlimits[1] != '':
-                    prm = network['{}-{}'.format(self.xlimits[0], self.xlimits[1])].s
-                else:
-                    prm = network.s
-                if pm == 'smith':
-                    rep = prm
-                    val = prm.val[:, param[0], param[1]]
-                    lines = self.axes().plot(npy.real(val), npy.imag(val),
-                                             picker=5,
-                                             label="{},S{}{}".format(
-                                                 network.name, param[0]+1, param[1]+1)
-                                             )
-                elif hasattr(prm, pm):
-                    rep = getattr(prm, pm)
-                    if param is None:
-                        lines = rep.plot(ax=ax, picker=5)
-                    else:
-                        lines = rep.plot(m=param[0], n=param[1], ax=ax, picker=5)
-                else:
-                    raise Exception("Unknown representation")
+            window = self.frequencyWindow(nwItem)
+            with span('plot', mode=pm) as s:
+                lines = plotTrace(ax, nwItem, pm, m, n, window, picker=5, color=self.nextColor())
+                s.set(points=sum(len(line.get_xdata()) for line in lines))
 
             if lines:
-                self._lines.extend(lines)
+                self.registerDetail(lines, parametric=(pm == 'smith'))
             return lines
 
+    def nextColor(self) -> str:
+        # pooled traces keep their colour across redraws, new ones take the first colour not in use
+        colors = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+        used = set(trace.get_color() for trace in self.trace2param)
+        for color in colors:
+            if color not in used:
+                return color
+        return colors[len(self.trace2param) % len(colors)]
+
+    def updateTrace(self, trace: Line2D):
+        p = self.trace2param[trace]
+        nwItem = p.parent()
+        window = self.frequencyWindow(nwItem)
+        x, y = deriveTrace(nwItem, self.plotMode, p.m, p.n, window)
+        trace.set_data(x, y)
+        self._revision[trace] = nwItem.revision
+        self._fulldata.pop(trace, None)
+        self.registerDetail([trace], parametric=(self.plotMode == 'smith'))
+        self._stale.discard(trace)
+
+    def updateTraces(self):
+        # recompute data in place, hidden traces are only refreshed once they are shown again
+        with span('update', mode=self.plotMode):
+            self._windows = {}
+            for trace in self.trace2param.keys():
+                if trace.get_visible():
+                    self.updateTrace(trace)
+                else:
+                    self._stale.add(trace)
+            self.removePreviewLines()
+            self.plotPreview()
+            self.removeEnvelope()
+            self.plotEnvelope()
+            ax = self.axes()
+            self.relim(ax)
+            ax.autoscale(True)
+            if self.xlimits is not None and self.plotMode in timeModes:
+                ax.set_xlim(*self.xlimits)
+            else:
+                ax.autoscale_view()
+            self.draw_idle()
+
+    def showPreview(self, previews: list[tuple[NetworkItem, NetworkItem]]):
+        # dashed overlay of the gated networks, not part of the model, the legend or picking
+        self.removePreviewLines()
+        self._previews = previews
+        self.plotPreview()
+        self.draw_idle()
+
+    def clearPreview(self):
+        if self._previews or self._previewLines:
+            self.removePreviewLines()
+            self._previews = []
+            self.draw_idle()
+
+    def plotPreview(self):
+        ax = self.axes()
+        for source, preview in self._previews:
+            window = self.frequencyWindow(preview)
+            for p in source.enabledParams():
+                trace = p.getTrace()
+                color = trace.get_color() if trace is not None else None
+                lines = plotTrace(ax, preview, self.plotMode, p.m, p.n, window, color=color, linestyle='--')
+                self.registerDetail(lines, parametric=(self.plotMode == 'smith'))
+                self._previewLines.extend(lines)
+
+    def removePreviewLines(self):
+        for line in self._previewLines:
+            line.remove()
+            self._fulldata.pop(line, None)
+        self._previewLines = []
+
+    def inEnvelope(self, nwItem: NetworkItem) -> bool:
+        return any(item is nwItem for item in self._envelope)
+
+    def envelopeActive(self) -> bool:
+        return len(self._envelope) > 0 and self.plotMode in envelopeModes
+
+    def showEnvelope(self, items: list[NetworkItem]):
+        # mean, standard deviation and a min/max or percentile band per parameter, a handful of
+        # artists however many networks there are. Their own traces are dropped meanwhile.
+        outside = disjoint(items)
+        if outside:
+            raise ValueError("Outside the sweep of {}: {}".format(
+                items[0].text(), ', '.join(item.text() for item in outside)))
+        self._envelope = list(items)
+        self.redrawAll()
+
+    def clearEnvelope(self):
+        if self._envelope:
+            self._envelope = []
+            self.redrawAll()
+
+    def setEnvelopePercentiles(self, percentiles: tuple[float, float]):
+        self.envelopePercentiles = percentiles
+        if self.envelopeActive():
+            self.refreshEnvelope()
+            self.draw_idle()
+
+    def refreshEnvelope(self):
+        self.removeEnvelope()
+        self.plotEnvelope()
+        ax = self.axes()
+        self.relim(ax)
+        ax.autoscale_view()
+
+    def plotEnvelope(self):
+        if not self.envelopeActive():
+            return
+        items = self._envelope
+        ax = self.axes()
+        window = self.frequencyWindow(items[0])
+        x = items[0].frequency(window) / items[0].network().frequency.multiplier
+        if len(x) == 0:
+            return
+        colors = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+        pixels = max(int(ax.bbox.width), 1)
+        scratch = npy.empty((len(items), len(x)))
+        with span('envelope', networks=len(items)) as s:
+            params = commonParams(items)
+            for i, (m, n) in enumerate(params):
+                mean, std, lo, hi = envelope(items, self.plotMode, m, n, window, self.envelopePercentiles, scratch)
+                color = colors[i % len(colors)]
+                for band, alpha in (((lo, hi), 0.15), ((mean - std, mean + std), 0.3)):
+                    collection = ax.fill_between(*decimateBand(x, *band, x[0], x[-1], pixels), color=color,
+                                                 alpha=alpha, linewidth=0)
+                    self._bands[collection] = (x, *band)
+                lines = ax.plot(x, mean, color=color, label="mean of {}, S{}{}".format(len(items), m + 1, n + 1))
+                self.registerDetail(lines)
+                self._envelopeLines.extend(lines)
+            s.set(points=len(x) * len(items) * len(params))
+
+    def removeEnvelope(self):
+        for line in self._envelopeLines:
+            line.remove()
+            self._fulldata.pop(line, None)
+        for band in self._bands:
+            band.remove()
+        self._envelopeLines = []
+        self._bands = {}
+
+    def decimateBands(self, ax: matplotlib.axes.Axes):
+        pixels = max(int(ax.bbox.width), 1)
+        xmin, xmax = sorted(ax.get_xlim())
+        for band, (x, lo, hi) in self._bands.items():
+            xs, los, his = decimateBand(x, lo, hi, xmin, xmax, pixels)
+            band.set_verts([npy.concatenate((npy.column_stack((xs, his)), npy.column_stack((xs, los))[::-1]))])
+
+    def relim(self, ax: matplotlib.axes.Axes):
+        # relim only looks at lines and patches, the envelope bands have to be added by hand
+        ax.relim(visible_only=True)
+        for x, lo, hi in self._bands.values():
+            finite = npy.isfinite(lo) & npy.isfinite(hi)  # gaps where a resampled sweep ends
+            if finite.any():
+                x = x[finite]
+                ax.update_datalim([(x[0], lo[finite].min()), (x[-1], hi[finite].max())])
+
+    def connectAxes(self):
+        ax = self.axes()
+        ax.callbacks.connect('xlim_changed', self.limitsChanged)
+        ax.callbacks.connect('ylim_changed', self.limitsChanged)
+
+    def traceData(self, trace: Line2D) -> tuple[npy.ndarray, npy.ndarray]:
+        # undecimated data of a trace
+        if trace in self._fulldata:
+            return self._fulldata[trace][:2]
+        x, y = trace.get_data(orig=True)
+        return npy.asarray(x, dtype=float), npy.asarray(y, dtype=float)
+
+    def registerDetail(self, lines: list[Line2D], parametric: bool = False):
+        for line in lines:
+            x, y = line.get_data(orig=True)
+            if len(x) > self.detailThreshold:
+                self._fulldata[line] = (npy.asarray(x, dtype=float), npy.asarray(y, dtype=float), parametric)
+                self.decimateLine(line, None)
+
+    def decimateLine(self, line: Line2D, ax: matplotlib.axes.Axes = None):
+        x, y, parametric = self._fulldata[line]
+        pixels = max(int(self.axes().bbox.width), 1)
+        if parametric:
+            zoom = 1.0
+            if ax is not None:  # zoomed into the chart, keep more points so detail stays sharp
+                xlim = ax.get_xlim()
+                ylim = ax.get_ylim()
+                zoom = max(npy.ptp(x) / max(abs(xlim[1] - xlim[0]), 1e-12),
+                           npy.ptp(y) / max(abs(ylim[1] - ylim[0]), 1e-12))
+                zoom = min(max(zoom, 1.0), 64.0)
+            line.set_data(*decimateParametric(x, y, int(pixels * zoom)))
+        else:
+            if ax is None:
+                xmin, xmax = x[0], x[-1]
+            else:
+                xmin, xmax = sorted(ax.get_xlim())
+            line.set_data(*decimateRectangular(x, y, xmin, xmax, pixels))
+
+    def limitsChanged(self, ax: matplotlib.axes.Axes):
+        for line in self._fulldata:
+            self.decimateLine(line, ax)
+        self.decimateBands(ax)
+
+    def on_resize(self, event):
+        if self._fulldata or self._bands:
+            self.limitsChanged(self.axes())
+
     def changePlotMode(self, index):
         oldmode = self.plotMode
         self.plotMode = list(plotModes.values())[index]
-        time_modes = ['s_time', 'z_time']
-        if (oldmode not in time_modes and self.plotMode not in time_modes) or (oldmode in time_modes and self.plotMode in time_modes):
+        if (oldmode not in timeModes and self.plotMode not in timeModes) or (oldmode in timeModes and self.plotMode in timeModes):
             pass
         else:
-            self.setXlimits('', '')
+            self.xlimits = None
         self.redrawAll()
 
-    def setXlimits(self, mini, maxi):
-        self.xlimits = [mini, maxi]
-        self.redrawAll()
+    def setXlimits(self, mini: float = None, maxi: float = None):
+        self.xlimits = None if mini is None else (mini, maxi)
+        self.updateTraces()
 
     def selectionChanged(self, selected: QItemSelection, deselected: QItemSelection):
         for idx in selected.indexes():
@@ -222,42 +596,92 @@ class MplCanvas(FigureCanvasQTAgg):
         self.draw_idle()
 
     def legendChange(self, columns: int):
-        self.axes().legend(ncol = columns)
+        self.legendColumns = columns
+        self.generate_line_to_legend()
         self.draw_idle()
 
     def generate_line_to_legend(self):
-        ax = self.axes()
-        if len(self._lines) == 0:
-            return
-        legend = ax.legend()
-        legend.set_draggable(True)
-        self.line2leg = {}
-        for legline, origline in zip(legend.get_lines(), self._lines):
-            legline.set_picker(5)  # Enable picking on the legend line.
-            self.line2leg[legline] = (origline, True)
-            self.line2leg[origline] = (legline, False)
+        with span('legend', entries=len(self.trace2param)):
+            ax = self.axes()
+            lines = [line for line in self.trace2param if line.get_visible()]
+            self.line2leg = {}
+            if len(lines) == 0 and not self._envelopeLines:
+                if ax.get_legend() is not None:
+                    ax.get_legend().remove()
+                return
+            legend = ax.legend(handles=lines + self._envelopeLines, ncol=self.legendColumns)
+            legend.set_draggable(True)
+            for legline, origline in zip(legend.get_lines(), lines):
+                legline.set_picker(5)  # Enable picking on the legend line.
+                self.line2leg[legline] = (origline, True)
+                self.line2leg[origline] = (legline, False)
 
     def pickLine(self, trace: Line2D):
+        if trace is not None and trace in self.line2leg and self.line2leg[trace][1]:  # legend entry
+            trace = self.line2leg[trace][0]
         if trace is not self.picked:
-            if self.picked is not None:
-                self.picked.set_linewidth(self.default_linewidth)
-                self.line2leg[self.picked][0].set_linewidth(self.default_linewidth)
-
             if trace is not None:
-                trace.set_linewidth(2 * self.default_linewidth)
-                self.line2leg[trace][0].set_linewidth(2 * self.default_linewidth)
-                if trace in self.line2leg:  # is an axis entry
-                    self.picked = trace
-                elif trace in self.line2leg.values():
-                    self.picked = self.line2leg[trace]
+                self.picked = trace
                 self.pickstate = 1
             else:
                 self.pickstate = 0
                 self.picked = None
+            self.blitOverlay()
+
+    def setCursorEnabled(self, b: bool):
+        self.cursor.enabled = b
+        self.cursor.hover = None
+        self.blitOverlay()
+
+    def drawHighlight(self):
+        # traces keep their normal width in every full draw, the highlight only exists in the blitted overlay
+        artists = [self.picked]
+        if self.picked in self.line2leg:
+            artists.append(self.line2leg[self.picked][0])
+        for artist in artists:
+            artist.set_linewidth(2 * self.default_linewidth)
+            self.figure.draw_artist(artist)
+            artist.set_linewidth(self.default_linewidth)
+
+    def blitOverlay(self):
+        # highlight and data cursor on top of the last full draw, cheap enough for every mouse move
+        if self._background is None:
             self.draw_idle()
+            return
+        if self._highlighted is not None and self._highlighted[0] is self.picked:
+            self.restore_region(self._highlighted[1])  # thick long traces are slow, don't draw them per mouse move
+        else:
+            self.restore_region(self._background)
+            self.highlight()
+        self.cursor.draw()
+        self.blit(self.figure.bbox)
+
+    def highlight(self):
+        if self.picked is not None:
+            self.drawHighlight()
+            self._highlighted = self.picked, self.copy_from_bbox(self.figure.bbox)
+        else:
+            self._highlighted = None, self._background
+
+    def on_draw(self, event):
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self.highlight()
+        self.cursor.draw()
+
+    def motion_event(self, event):
+        if self.cursor.enabled:
+            hover = self.cursor.snap(event)
+            if hover != self.cursor.hover:
+                self.cursor.hover = hover
+                self.blitOverlay()
+
+    def axes_leave_event(self, event):
+        if self.cursor.hover is not None:
+            self.cursor.hover = None
+            self.blitOverlay()
 
     def on_pick(self, event: matplotlib.backend_bases.Event):
-        if isinstance(event.artist, Line2D):
+        if isinstance(event.artist, Line2D) and event.artist in self.line2leg:
             if self.line2leg[event.artist][1]:
                 trace = self.line2leg[event.artist][0]
             else:
@@ -271,36 +695,34 @@ class MplCanvas(FigureCanvasQTAgg):
     def button_release_event(self, event: matplotlib.backend_bases.Event):
         if event.button == MouseButton.LEFT:
             if self.picked is None:
-                for line in self.line2leg:
-                    self.line2leg[line][0].set_linewidth(self.default_linewidth)
-                    line.set_linewidth(self.default_linewidth)
                 self.pickstate = 0
-                self.draw_idle()
             elif self.pickstate == 2:
-                self.picked.set_linewidth(self.default_linewidth)
-                self.line2leg[self.picked][0].set_linewidth(self.default_linewidth)
-                self.picked = None
+                self.pickLine(None)
                 self.selectionModel.clear()
-                self.draw_idle()
             self.pickstate = 2
 
     def button_press_event(self, event):
-        pass
+        if event.dblclick and event.button == MouseButton.LEFT and self.cursor.enabled:
+            self.cursor.addMarker()
+            self.blitOverlay()
 
     def key_event(self, event):
         if event.key == 'delete' and self.picked is not None:
             try:
                 param = self.trace2param[self.picked]
-                self.picked = None
-                self.pickstate = 0
+                self.pickLine(None)
                 param.disable()
             except ValueError:
                 print("picked error: {}".format(self.picked))
+        elif event.key == 'm' and self.cursor.enabled:
+            self.cursor.addMarker()
+            self.blitOverlay()
+        elif event.key == 'escape' and self.cursor.markers:
+            self.cursor.clearMarkers()
+            self.blitOverlay()
         elif event.key == 'f2' and self.picked is not None:
-            h, l = self.axes.get_legend_handles_labels()
-            index = self.figure.axes[0].lines.index(self.picked)
-            (text, result) = QInputDialog.getText(self, 'Enter new Label', 'Label', text=l[index])
+            (text, result) = QInputDialog.getText(self, 'Enter new Label', 'Label', text=self.picked.get_label())
             if text:
-                l[index] = text
-                self.axes.legend(h, l)
+                self.picked.set_label(text)
+                self.generate_line_to_legend()
                 self.draw_idle()
@@ -1,17 +1,31 @@
+import itertools
 import typing
 
 import matplotlib.lines
+import numpy as npy
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from skrf.network2 import Network as SkNetwork
+
+from lrucache import LRUCache
+from resample import gridKey, plan
+
+if typing.TYPE_CHECKING:
+    from skrf.network2 import Network as SkNetwork  # skrf takes seconds to import, load it with the first file
 
 
 class NetworkItem(QStandardItem):
     _type = 1516
+    cacheBudget = 128 * 1024 ** 2  # bytes of derived trace data kept per network
+    _serials = itertools.count()
 
-    def __init__(self, network: SkNetwork):
-        self._network: SkNetwork = network
+    def __init__(self, network: 'SkNetwork'):
+        self._network: 'SkNetwork' = network
         self._parameters: dict[tuple[int, int], 'ParamItem'] = {}
+        self.cache = LRUCache(self.cacheBudget)  # (mode, m, n, window) -> derived x, y
+        self.revision = 0  # bumped whenever the S-parameters are replaced
+        self.serial = next(self._serials)  # unlike id(), never reused, (serial, revision) names the data for good
+        self.filename: str = None  # source file, if any
+        self._gridKey: tuple = None  # (revision, key) of the frequency grid
         super(QStandardItem, self).__init__()
         self._makeChildren()
         self.setData(network.name, Qt.DisplayRole)
@@ -23,11 +37,54 @@ class NetworkItem(QStandardItem):
     def setData(self, value: typing.Any, role: int = ...) -> None:
         if role == Qt.EditRole:
             self._network.name = value
+            self.cache.clear()
         super().setData(value, role)
 
-    def network(self) -> SkNetwork:
+    def network(self) -> 'SkNetwork':
         return self._network
 
+    def setNetwork(self, network: 'SkNetwork'):
+        # same port count expected, the ParamItems are kept
+        self._network = network
+        self.revision += 1
+        self.cache.clear()
+        self.emitDataChanged()
+
+    def frequency(self, window: slice = None) -> npy.ndarray:
+        f = self._network.frequency.f
+        return f if window is None else f[window]
+
+    def window(self, start: float, stop: float) -> slice:
+        f = self._network.frequency.f
+        return slice(npy.searchsorted(f, start, 'left'), npy.searchsorted(f, stop, 'right'))
+
+    def sParam(self, m: int, n: int, window: slice = None) -> npy.ndarray:
+        # only touches the pages of one trace when the network is memory-mapped
+        s = self._network.s.val
+        return s[:, m, n] if window is None else s[window, m, n]
+
+    def gridKey(self) -> tuple:
+        if self._gridKey is None or self._gridKey[0] != self.revision:
+            self._gridKey = self.revision, gridKey(self.frequency())
+        return self._gridKey[1]
+
+    def resampled(self, f: npy.ndarray, key: tuple = None) -> npy.ndarray:
+        # all S-parameters on another frequency grid, NaN outside this network's sweep
+        key = key or gridKey(f)
+        if key == self.gridKey():
+            return self._network.s.val
+        s = self.cache.get(('resampled', key))
+        if s is None:
+            s = plan(self.frequency(), f, self.gridKey(), key).apply(self._network.s.val)
+            self.cache.put(('resampled', key), s, s.nbytes)
+        return s
+
+    def resampledParam(self, m: int, n: int, f: npy.ndarray, key: tuple = None) -> npy.ndarray:
+        key = key or gridKey(f)
+        if key == self.gridKey():
+            return self.sParam(m, n)
+        return plan(self.frequency(), f, self.gridKey(), key).apply(self.sParam(m, n))
+
     def __str__(self):
         return self._network.__str__()
 
@@ -84,9 +141,15 @@ class ParamItem(QStandardItem):
     def getTrace(self):
         return self._trace
 
+    def setTrace(self, trace: matplotlib.lines.Line2D):
+        self._trace = trace
+
     def toTuple(self):
         return self.m, self.n
 
+    def values(self, window: slice = None):
+        return self._parent.sParam(self.m, self.n, window)
+
     def disable(self):
         self.setCheckState(False)
 
@@ -0,0 +1,116 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import numpy as npy
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import instrumentation
+import workerpool
+from networkstore import NetworkStore, storeArray
+from touchstone import readTouchstone
+
+
+def parseTouchstone(filename: str, storeDir: str = None, mapThreshold: int = 0):
+    # runs inside a worker, so only plain arrays are handed back across the process boundary
+    name, f, s, z0 = readTouchstone(filename)
+    if storeDir is not None and s.nbytes >= mapThreshold:
+        s = storeArray(storeDir, s)  # hand back the path, the GUI process maps it
+    return name, f, s, z0
+
+
+def buildNetwork(name, f, s, z0):
+    import skrf
+    from skrf.network2 import Network
+    from mappednetwork import openNetwork, mappedNetwork
+    if isinstance(s, str):
+        return openNetwork(name, f, s, z0)
+    if isinstance(s, npy.memmap):
+        return mappedNetwork(name, f, s, z0)  # e.g. mapped out of a session file
+    nw = Network(frequency=skrf.Frequency.from_f(f, unit='hz'), s=s, z0=z0, name=name)
+    nw.frequency.unit = 'ghz'  # fix for https://github.com/scikit-rf/scikit-rf/issues/293
+    return nw
+
+
+class NetworkLoader(QObject):
+    networkLoaded = pyqtSignal(str, object)
+    loadFailed = pyqtSignal(str, str)
+    progress = pyqtSignal(int, int, str)
+    finished = pyqtSignal()
+    _futureDone = pyqtSignal(object)
+
+    def __init__(self, parent=None, workers: int = None, processes: bool = True, store: NetworkStore = None):
+        super(NetworkLoader, self).__init__(parent)
+        self.workers = workers or workerpool.workers()
+        self.processes = processes
+        self._executor = None
+        self._pending: dict[Future, str] = {}
+        self._submitted: dict[Future, float] = {}
+        self._total = 0
+        self._done = 0
+        self.store = store or NetworkStore()
+        # futures complete on executor threads, hop back to the thread owning the loader first
+        self._futureDone.connect(self._collect)
+
+    def executor(self):
+        if self.processes:
+            return workerpool.executor()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def isRunning(self) -> bool:
+        return len(self._pending) > 0
+
+    def load(self, filenames: list[str]):
+        filenames = [f for f in filenames if f]
+        if not filenames:
+            return
+        executor = self.executor()
+        storeDir, mapThreshold = self.store.workerArgs()
+        self._total += len(filenames)
+        for filename in filenames:
+            future = executor.submit(parseTouchstone, filename, storeDir, mapThreshold)
+            self._pending[future] = filename
+            self._submitted[future] = time.perf_counter()
+            future.add_done_callback(self._futureDone.emit)
+        self.progress.emit(self._done, self._total, '')
+
+    def cancel(self):
+        if not self._pending:
+            return
+        for future in list(self._pending.keys()):
+            future.cancel()
+        self._pending.clear()
+        self._submitted.clear()
+        self._finish()
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.store.cleanup()
+
+    def _collect(self, future: Future):
+        filename = self._pending.pop(future, None)
+        submitted = self._submitted.pop(future, None)
+        if filename is None or future.cancelled():  # cancelled batch, drop silently
+            return
+        self._done += 1
+        try:
+            result = future.result()
+        except Exception as e:
+            self.loadFailed.emit(filename, str(e))
+        else:
+            # wall time in the pool including queueing, the worker's own timings don't cross the process boundary
+            instrumentation.record('parse', time.perf_counter() - submitted, file=os.path.basename(filename))
+            self.networkLoaded.emit(filename, result)
+        self.progress.emit(self._done, self._total, os.path.basename(filename))
+        if not self._pending:
+            self._finish()
+
+    def _finish(self):
+        self._total = 0
+        self._done = 0
+        self.finished.emit()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import uuid
+import weakref
+
+import numpy as npy
+
+
+def storeArray(directory: str, s: npy.ndarray) -> str:
+    # port-major on disk, so a single (m, n) trace is one contiguous read
+    path = os.path.join(directory, uuid.uuid4().hex + '.npy')
+    npy.save(path, npy.ascontiguousarray(npy.transpose(s, (1, 2, 0)), dtype=complex))
+    return path
+
+
+def openArray(path: str) -> npy.memmap:
+    return npy.load(path, mmap_mode='r').transpose(2, 0, 1)
+
+
+def storedPath(s: npy.ndarray, directory: str) -> str:
+    # the store .npy behind s, None for arrays in RAM or mapped out of a session zip
+    if not isinstance(s, npy.memmap) or not s.filename:
+        return None
+    path = os.path.abspath(s.filename)
+    if not path.endswith('.npy') or os.path.dirname(path) != os.path.abspath(directory):
+        return None
+    return path
+
+
+def removeFile(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # still open somewhere, cleanup() takes it at exit
+
+
+class NetworkStore:
+    def __init__(self, threshold: int = 32 * 1024 ** 2):
+        self.threshold = threshold  # bytes, smaller networks stay in RAM
+        self.enabled = True
+        self._directory = None
+
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='radiolarite-')
+        return self._directory
+
+    def workerArgs(self):
+        if not self.enabled:
+            return None, 0
+        return self.directory(), self.threshold
+
+    def track(self, s: npy.ndarray):
+        # remove the file once its last mapping is gone, e.g. after a watched file was reloaded
+        if self._directory is None or storedPath(s, self._directory) is None:
+            return
+        mapping = s
+        while isinstance(mapping, npy.ndarray):
+            mapping = mapping.base  # down to the mmap, views of the array keep it alive
+        weakref.finalize(mapping, removeFile, s.filename)
+
+    def cleanup(self):
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)  # still mapped files stay behind on Windows
+            self._directory = None
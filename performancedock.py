@@ -0,0 +1,99 @@
+import sys
+
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QDockWidget, QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel, \
+    QPushButton, QHBoxLayout, QHeaderView, QAbstractItemView
+
+import instrumentation
+from networkitem import NetworkItem
+
+
+def hitRate(hits: int, misses: int) -> str:
+    total = hits + misses
+    return "{:.0f}% of {}".format(100. * hits / total, total) if total else "-"
+
+
+class PerformanceDock(QDockWidget):
+    closed = pyqtSignal()
+    columns = ['Span', 'Count', 'Last (ms)', 'Mean (ms)', 'Max (ms)', 'Details']
+
+    def __init__(self, parent, networkModel):
+        super(PerformanceDock, self).__init__("Performance", parent)
+        self.networkModel = networkModel
+        widget = QWidget(self)
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.table = QTableWidget(0, len(self.columns), widget)
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.cacheLabel = QLabel(widget)
+        self.cacheLabel.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.cacheLabel)
+
+        buttons = QHBoxLayout()
+        clearButton = QPushButton("Clear", widget)
+        clearButton.clicked.connect(self.clear)
+        buttons.addStretch()
+        buttons.addWidget(clearButton)
+        layout.addLayout(buttons)
+        self.setWidget(widget)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
+
+    def clear(self):
+        instrumentation.clear()
+        self.refresh()
+
+    def refresh(self):
+        summary = instrumentation.summary()
+        names = [n for n in instrumentation.spans if n in summary] + sorted(set(summary) - set(instrumentation.spans))
+        self.table.setRowCount(len(names))
+        for row, name in enumerate(names):
+            entry = summary[name]
+            details = ', '.join("{}={}".format(k, v) for k, v in entry['info'].items())
+            values = [name, str(entry['count']), "{:.1f}".format(entry['last']), "{:.1f}".format(entry['mean']),
+                      "{:.1f}".format(entry['max']), details]
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if 0 < column < 5:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.cacheLabel.setText(self.cacheStatistics())
+
+    def cacheStatistics(self) -> str:
+        hits = misses = size = networks = points = 0
+        for row in range(self.networkModel.rowCount()):
+            item = self.networkModel.item(row)
+            if isinstance(item, NetworkItem):
+                networks += 1
+                hits += item.cache.hits
+                misses += item.cache.misses
+                size += item.cache.size
+                points += len(item.frequency())
+        text = "Trace cache: {} hits, {:.1f} MB over {} networks ({} points each on average)".format(
+            hitRate(hits, misses), size / 1024 ** 2, networks, points // networks if networks else 0)
+        if 'gating' in sys.modules:  # don't import it just to report on it
+            windows = sys.modules['gating']._windows
+            text += "\nGate windows: {} hits, {} cached".format(hitRate(windows.hits, windows.misses), len(windows))
+        return text
@@ -1,15 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+
 import skrf
-from PyQt5.QtCore import pyqtSignal, QObject
+from skrf.network2 import Network
+from PyQt5.QtCore import pyqtSignal, QObject, QTimer
 from PyQt5.QtWidgets import QWidget, QLabel, QLineEdit, QVBoxLayout, QPushButton, QMessageBox, QGroupBox, \
-    QFormLayout, QComboBox
+    QFormLayout, QComboBox, QCheckBox
 from PyQt5.QtGui import QRegularExpressionValidator
 
 import validatinglineedit as validedit
+from gating import transform, applyGate, timeGate
+from lrucache import LRUCache
+from networkitem import NetworkItem
 from validatinglineedit import ValidatingLineEdit
 
+title = "Time Domain Gating"
+processes = {'gate': timeGate}
+
 class TimeGatingDialog(QWidget):
     closed = pyqtSignal()
     resultChanged = pyqtSignal(object)
+    previewChanged = pyqtSignal(object)
 
 
 
@@ -26,21 +36,159 @@ class TimeGatingDialog(QWidget):
         formlayout.addRow("Center", self.centerTimeEdit)
         self.spanTimeEdit = validedit.ValidatingTimeEdit("1")
         formlayout.addRow("Span", self.spanTimeEdit)
+        self.previewCheck = QCheckBox("Live preview")
+        formlayout.addRow("", self.previewCheck)
 
         okButton = QPushButton("Ok")
         formlayout.addRow("", okButton)
         okButton.clicked.connect(self.changed)
 
+        # restart on every keystroke, only recompute once editing pauses
+        self.previewTimer = QTimer(self)
+        self.previewTimer.setSingleShot(True)
+        self.previewTimer.setInterval(250)
+        self.previewTimer.timeout.connect(self.preview)
+        self.centerTimeEdit.textChanged.connect(self.schedulePreview)
+        self.spanTimeEdit.textChanged.connect(self.schedulePreview)
+        self.windowselect.currentIndexChanged.connect(self.schedulePreview)
+        self.previewCheck.toggled.connect(self.schedulePreview)
+
+    def values(self):
+        center = self.centerTimeEdit.getValue()
+        span = self.spanTimeEdit.getValue()
+        window = self.windowselect.currentText()
+        return {'center': center, 'span': span, 'window': window}
+
+    def schedulePreview(self):
+        if self.previewCheck.isChecked():
+            self.previewTimer.start()
+        else:
+            self.previewTimer.stop()
+            self.previewChanged.emit(None)
+
+    def preview(self):
+        try:
+            self.previewChanged.emit(self.values())
+        except ValueError:
+            pass  # half typed value, wait for the next edit
+
     def changed(self):
         try:
-            center = self.centerTimeEdit.getValue()
-            span = self.spanTimeEdit.getValue()
-            window = self.windowselect.currentText()
-            self.resultChanged.emit({'center': center, 'span': span, 'window': window})
+            values = self.values()
+            self.previewTimer.stop()
+            self.previewChanged.emit(None)
+            self.resultChanged.emit(values)
             self.close()
         except ValueError:
             QMessageBox.critical(self, "Error", "No valid values given.")
 
+    def closeEvent(self, event):
+        self.previewTimer.stop()
+        self.previewChanged.emit(None)
+        self.closed.emit()
+        super().closeEvent(event)
+
+
+class GatePreviewWorker(QObject):
+    previewReady = pyqtSignal(object)
+    _futureDone = pyqtSignal(int, object)
+
+    def __init__(self, parent=None):
+        super(GatePreviewWorker, self).__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1)  # numpy's FFT releases the GIL
+        self._generation = 0
+        self._pending: Future = None
+        self._transforms = LRUCache(256 * 1024 ** 2)  # only touched from the worker thread
+        self._futureDone.connect(self._collect)
+
+    def request(self, items: list, center: float, span: float, window: str):
+        self._generation += 1
+        if self._pending is not None:
+            self._pending.cancel()  # superseded before it started
+        jobs = [(item, (item.serial, item.revision), item.network().frequency.f, item.network().s.val)
+                for item in items]
+        generation = self._generation
+        self._pending = self._executor.submit(self._compute, jobs, center, span, window)
+        self._pending.add_done_callback(lambda future: self._futureDone.emit(generation, future))
+
+    def cancel(self):
+        self._generation += 1
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _compute(self, jobs, center, span, window):
+        result = []
+        for item, key, f, s in jobs:
+            s_td = self._transforms.get(key)
+            if s_td is None:
+                s_td = transform(f, s)
+                self._transforms.put(key, s_td, s_td.nbytes)
+            result.append((item, applyGate(f, s_td, center, span, window)))
+        return result
+
+    def _collect(self, generation: int, future: Future):
+        if generation != self._generation or future.cancelled():
+            return  # a newer request is on its way
+        self._pending = None
+        try:
+            self.previewReady.emit(future.result())
+        except Exception as e:
+            print("gate preview failed: {}".format(e))
+
+
+class TimeGatingPlugin(QObject):
+    def __init__(self, host):
+        super(TimeGatingPlugin, self).__init__(host)
+        self.host = host
+        self.dialog = TimeGatingDialog(parent=None)
+        self.preview = GatePreviewWorker(self)
+        self.dialog.resultChanged.connect(self.gate)
+        self.dialog.previewChanged.connect(self.requestPreview)
+        self.preview.previewReady.connect(self.showPreview)
+        host.aboutToQuit.connect(self.shutdown)
+
+    def activate(self):
+        if not self.host.selectedNetworkItems():
+            self.host.critical("Error", "No Network selected")
+            return
+        self.dialog.show()
+
+    def gate(self, tmp: dict):
+        items = self.host.selectedNetworkItems()
+        if not items:
+            self.host.critical("Error", "No Network selected")
+            return
+        window = tmp['window'].lower()
+        self.host.run(timeGate, items, tmp['center'].getValue(), tmp['span'].getValue(), window, suffix=' (gated)')
+
+    def requestPreview(self, tmp: dict):
+        items = self.host.selectedNetworkItems()
+        if tmp is None or not items:
+            self.preview.cancel()
+            self.host.canvas().clearPreview()
+            return
+        self.preview.request(items, center=tmp['center'].getValue(), span=tmp['span'].getValue(),
+                             window=tmp['window'].lower())
+
+    def showPreview(self, result: list):
+        previews = []
+        for item, s in result:
+            nw = item.network()
+            nw2 = Network(frequency=nw.frequency.copy(), s=s, z0=nw.z0, name=nw.name + ' (preview)')
+            nw2.frequency.unit = 'GHz'
+            previews.append((item, NetworkItem(nw2)))
+        self.host.canvas().showPreview(previews)
+
+    def shutdown(self):
+        self.preview.shutdown()
+        self.dialog.close()
+
 
-def plugin_main():
-    print("module loaded")
+def plugin_main(host):
+    plugin = TimeGatingPlugin(host)
+    return plugin.activate
@@ -0,0 +1,147 @@
+import importlib
+import os
+import re
+from concurrent.futures import Future
+
+import numpy as npy
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QMenu, QMessageBox, QAction
+
+import workerpool
+from networkitem import NetworkItem
+
+pluginDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plugin')
+re_title = re.compile(r'^title\s*=\s*[\'"](.+)[\'"]\s*$', re.MULTILINE)
+
+
+def runProcess(func, f: npy.ndarray, s: npy.ndarray, args: tuple):
+    # executed in a worker process, func is a module level function declared in a plugin's processes
+    result = npy.asarray(func(f, s, *args))
+    if result.shape != s.shape:
+        raise ValueError("{} returned shape {}, expected {}".format(func.__name__, result.shape, s.shape))
+    return result
+
+
+def pluginTitle(path: str, module: str) -> str:
+    # read the title without importing, plugins must not cost anything before they are used
+    try:
+        with open(path, encoding='utf-8') as file:
+            match = re_title.search(file.read())
+    except OSError:
+        match = None
+    return match.group(1) if match else module.replace('_', ' ').title()
+
+
+def discoverPlugins(directory: str = pluginDirectory) -> list[tuple[str, str]]:
+    plugins = []
+    if not os.path.isdir(directory):
+        return plugins
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        module, ext = os.path.splitext(entry.name)
+        if entry.is_file() and ext == '.py' and not module.startswith('_'):
+            plugins.append((module, pluginTitle(entry.path, module)))
+    return plugins
+
+
+class PluginHost(QObject):
+    # what plugins get to see of the main window
+    aboutToQuit = pyqtSignal()
+    _futureDone = pyqtSignal(object)
+
+    def __init__(self, window):
+        super(PluginHost, self).__init__(window)
+        self.window = window
+        self.processes = set()  # functions plugins declared safe to run in a worker process
+        self._pending: dict[Future, tuple] = {}
+        self._errors = []
+        self._futureDone.connect(self._collect)
+
+    def canvas(self):
+        return self.window.canvas
+
+    def model(self):
+        return self.window.networkModel
+
+    def selectedNetworkItems(self) -> list[NetworkItem]:
+        return self.window.getSelectedNetworkItems()
+
+    def critical(self, title: str, message: str):
+        QMessageBox().critical(self.window, title, message)
+
+    def declare(self, plugin):
+        for name, func in getattr(plugin, 'processes', {}).items():
+            if func.__qualname__ != func.__name__:  # has to be picklable by reference
+                raise ValueError("process '{}' is not a module level function".format(name))
+            self.processes.add(func)
+
+    def run(self, func, items: list[NetworkItem], *args, suffix: str = ''):
+        # one job per network on the shared process pool, every result is appended as a new NetworkItem
+        if func not in self.processes:
+            raise ValueError("{} is not declared in a plugin's processes".format(func.__name__))
+        executor = workerpool.executor()
+        for item in items:
+            nw = item.network()
+            future = executor.submit(runProcess, func, nw.frequency.f, npy.asarray(nw.s.val), args)
+            self._pending[future] = (nw, suffix)
+            future.add_done_callback(self._futureDone.emit)
+
+    def isRunning(self) -> bool:
+        return len(self._pending) > 0
+
+    def _collect(self, future: Future):
+        job = self._pending.pop(future, None)
+        if job is None or future.cancelled():
+            return
+        nw, suffix = job
+        from skrf.network2 import Network
+        try:
+            s = future.result()
+        except Exception as e:
+            self._errors.append("{}: {}".format(nw.name, e))
+        else:
+            nw2 = Network(frequency=nw.frequency.copy(), s=s, z0=nw.z0, name=nw.name + suffix)
+            nw2.frequency.unit = 'GHz'
+            self.model().invisibleRootItem().appendRow(NetworkItem(nw2))
+        if not self._pending and self._errors:
+            self.critical("Plugin Error", "\n".join(self._errors))
+            self._errors = []
+
+    def shutdown(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self.aboutToQuit.emit()
+
+
+class PluginManager(QObject):
+    def __init__(self, window, menu: QMenu, directory: str = pluginDirectory):
+        super(PluginManager, self).__init__(window)
+        self.host = PluginHost(window)
+        self.menu = menu
+        self.directory = directory
+        self.actions: dict[str, QAction] = {}
+        self._activate = {}  # module name -> callable returned by plugin_main
+
+    def discover(self):
+        for module, title in discoverPlugins(self.directory):
+            if module in self.actions:
+                continue
+            action = self.menu.addAction(title)
+            action.triggered.connect(lambda checked, module=module: self.activate(module))
+            self.actions[module] = action
+
+    def activate(self, module: str):
+        if module not in self._activate:
+            try:
+                plugin = importlib.import_module('plugin.' + module)
+                self.host.declare(plugin)
+                self._activate[module] = plugin.plugin_main(self.host)
+            except Exception as e:
+                print("plugin {} failed to load: {}".format(module, e))
+                self.host.critical("Plugin Error", "Could not load plugin '{}':\n{}".format(module, e))
+                return
+        if self._activate[module] is not None:
+            self._activate[module]()
+
+    def shutdown(self):
+        self.host.shutdown()
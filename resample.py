@@ -0,0 +1,53 @@
+import hashlib
+import threading
+
+import numpy as npy
+
+from lrucache import LRUCache
+
+_plans = LRUCache(256 * 1024 ** 2)
+_lock = threading.Lock()
+
+
+def gridKey(f: npy.ndarray) -> tuple:
+    # content hash, so the grids of two files with the same sweep share their plans
+    f = npy.ascontiguousarray(f, dtype=float)
+    return len(f), hashlib.blake2b(f, digest_size=16).digest()
+
+
+class InterpolationPlan:
+    # linear interpolation from one frequency grid onto another as gather indices and weights,
+    # target points outside the source sweep come out as NaN
+    def __init__(self, source: npy.ndarray, target: npy.ndarray):
+        last = max(len(source) - 2, 0)
+        self.lower = npy.clip(npy.searchsorted(source, target, 'right') - 1, 0, last)
+        self.upper = npy.minimum(self.lower + 1, len(source) - 1)
+        span = source[self.upper] - source[self.lower]
+        with npy.errstate(divide='ignore', invalid='ignore'):
+            self.weight = npy.where(span > 0, (target - source[self.lower]) / span, 0.)
+        self.outside = (target < source[0]) | (target > source[-1])
+        self.nbytes = self.lower.nbytes + self.upper.nbytes + self.weight.nbytes + self.outside.nbytes
+
+    def apply(self, s: npy.ndarray) -> npy.ndarray:
+        # s is (f, ...), every trace is resampled by the same two gathers
+        w = self.weight.reshape((-1,) + (1,) * (s.ndim - 1))
+        out = npy.take(s, self.lower, axis=0) * (1 - w)
+        out += npy.take(s, self.upper, axis=0) * w
+        if self.outside.any():
+            out[self.outside] = npy.nan
+        return out
+
+
+def plan(source: npy.ndarray, target: npy.ndarray, sourceKey: tuple = None, targetKey: tuple = None):
+    key = (sourceKey or gridKey(source), targetKey or gridKey(target))
+    with _lock:
+        p = _plans.get(key)
+        if p is None:
+            p = InterpolationPlan(source, target)
+            _plans.put(key, p, p.nbytes)
+    return p
+
+
+def resample(source: npy.ndarray, s: npy.ndarray, target: npy.ndarray, sourceKey: tuple = None,
+             targetKey: tuple = None) -> npy.ndarray:
+    return plan(source, target, sourceKey, targetKey).apply(s)
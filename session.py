@@ -0,0 +1,95 @@
+import json
+import os
+import struct
+import zipfile
+
+import numpy as npy
+
+from networkitem import NetworkItem
+
+sessionExtension = '.rls'
+sessionFilter = "Radiolarite Sessions (*.rls)"
+sessionVersion = 1
+manifestName = 'session.json'
+alignment = 64  # npy headers are padded to 64 bytes, aligned members give aligned arrays
+paddingId = 0xd935  # extra field used for alignment padding, as Android's zipalign does
+
+
+def writeArray(zf: zipfile.ZipFile, name: str, array: npy.ndarray):
+    # stored, not deflated, so the array can be mapped straight out of the container
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_STORED
+    header = zipfile.sizeFileHeader + len(name.encode()) + 20  # 20 bytes zip64 extra from force_zip64
+    pad = -(zf.fp.tell() + header + 4) % alignment
+    info.extra = struct.pack('<HH', paddingId, pad) + bytes(pad)
+    with zf.open(info, 'w', force_zip64=True) as fh:
+        npy.lib.format.write_array(fh, array, allow_pickle=False)  # streamed in chunks, memmaps are not loaded
+
+
+def mapArray(path: str, zf: zipfile.ZipFile, name: str) -> npy.memmap:
+    info = zf.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError("{} is compressed and cannot be mapped".format(name))
+    with open(path, 'rb') as fh:
+        fh.seek(info.header_offset)
+        local = struct.unpack(zipfile.structFileHeader, fh.read(zipfile.sizeFileHeader))
+        fh.seek(local[zipfile._FH_FILENAME_LENGTH] + local[zipfile._FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+        version = npy.lib.format.read_magic(fh)
+        if version == (1, 0):
+            shape, fortran, dtype = npy.lib.format.read_array_header_1_0(fh)
+        else:
+            shape, fortran, dtype = npy.lib.format.read_array_header_2_0(fh)
+        offset = fh.tell()
+    return npy.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran else 'C')
+
+
+def readArray(zf: zipfile.ZipFile, name: str) -> npy.ndarray:
+    with zf.open(name) as fh:
+        return npy.lib.format.read_array(fh, allow_pickle=False)
+
+
+def saveSession(filename: str, items: list[NetworkItem], state: dict):
+    # one uncompressed zip: session.json plus port-major S, f and z0 arrays per network
+    networks = []
+    tmp = filename + '.part'  # written next to the target and renamed, the old file may still be mapped
+    try:
+        with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED) as zf:
+            for i, item in enumerate(items):
+                nw = item.network()
+                prefix = 'networks/{}/'.format(i)
+                writeArray(zf, prefix + 's.npy', npy.transpose(npy.asarray(nw.s.val, dtype=complex), (1, 2, 0)))
+                writeArray(zf, prefix + 'f.npy', npy.asarray(nw.frequency.f, dtype=float))
+                z0 = npy.asarray(nw.z0)
+                if z0.ndim == 2 and npy.all(z0 == z0[0]):
+                    z0 = z0[0]  # one impedance per port, skrf broadcasts it over the frequencies again
+                writeArray(zf, prefix + 'z0.npy', z0)
+                networks.append({'name': item.text(), 'filename': item.filename, 'data': prefix,
+                                 'enabled': [[p.m, p.n] for p in item.enabledParams()]})
+            manifest = dict(state, format='radiolarite-session', version=sessionVersion, networks=networks)
+            zf.writestr(manifestName, json.dumps(manifest, indent=1))
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def loadSession(filename: str):
+    # S-parameters stay on disk, only the traces being plotted are paged in
+    from networkloader import buildNetwork
+    try:
+        with zipfile.ZipFile(filename) as zf:
+            manifest = json.loads(zf.read(manifestName))
+            if manifest.get('format') != 'radiolarite-session':
+                raise ValueError("{} is not a session file".format(filename))
+            if manifest.get('version', 0) > sessionVersion:
+                raise ValueError("{} was saved by a newer version".format(filename))
+            networks = []
+            for entry in manifest['networks']:
+                prefix = entry['data']
+                s = mapArray(filename, zf, prefix + 's.npy').transpose(2, 0, 1)
+                nw = buildNetwork(entry['name'], readArray(zf, prefix + 'f.npy'), s, readArray(zf, prefix + 'z0.npy'))
+                networks.append((nw, entry['filename'], [tuple(p) for p in entry['enabled']]))
+    except (zipfile.BadZipFile, KeyError, json.JSONDecodeError) as e:
+        raise ValueError("{} is not a valid session file ({})".format(filename, e))
+    return manifest, networks
@@ -0,0 +1,68 @@
+import numpy as npy
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from lrucache import LRUCache
+
+backgroundGid = 'smith-background'  # marks the image standing in for skrf's chart
+
+
+def smithAxes(ax):
+    # the axes look skrf's smith() leaves behind, without its artists
+    ax.grid(False)
+    ax.minorticks_off()
+    ax.set_xticks([])
+    ax.set_yticks([])
+    for spine in ax.spines.values():
+        spine.set_color('none')
+    ax.set_aspect('equal', adjustable='box')
+    ax.set_autoscale_on(False)
+
+
+def drawSmith(ax):
+    from skrf.plotting import smith
+    smith(ax=ax, draw_labels=True, draw_vswr=True)
+
+
+class SmithBackground:
+    # skrf draws the chart from ~50 circles and annotations, which is slow to build and to draw.
+    # It is built once on a scratch figure, resized to the canvas, and shown as an image.
+    def __init__(self, budget: int = 64 * 1024 ** 2):
+        self._chart: tuple = None  # scratch figure, axes, default limits
+        self.images = LRUCache(budget)  # (size, dpi, position, limits) -> RGBA pixels of the axes area
+
+    def chart(self, size: tuple[float, float], dpi: float):
+        if self._chart is None:
+            figure = Figure(figsize=size, dpi=dpi)
+            FigureCanvasAgg(figure)
+            ax = figure.add_subplot(111)
+            drawSmith(ax)
+            self._chart = figure, ax, (ax.get_xlim(), ax.get_ylim())
+        figure = self._chart[0]
+        if figure.dpi != dpi or tuple(figure.get_size_inches()) != tuple(size):
+            figure.set_dpi(dpi)
+            figure.set_size_inches(size)
+        return self._chart
+
+    def limits(self, size: tuple[float, float], dpi: float):
+        return self.chart(size, dpi)[2]
+
+    def render(self, size: tuple[float, float], dpi: float, position: tuple, xlim: tuple, ylim: tuple) -> npy.ndarray:
+        key = (size, dpi, position, xlim, ylim)
+        pixels = self.images.get(key)
+        if pixels is None:
+            figure, ax, _ = self.chart(size, dpi)
+            ax.set_position(position)
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+            figure.canvas.draw()
+            x0, y0, x1, y1 = npy.round(ax.get_window_extent().extents).astype(int)
+            rgba = npy.asarray(figure.canvas.buffer_rgba())
+            height = rgba.shape[0]
+            pixels = rgba[height - y1:height - y0, x0:x1].copy()
+            self.images.put(key, pixels, pixels.nbytes)
+        return pixels
+
+    def clear(self):
+        self._chart = None
+        self.images.clear()
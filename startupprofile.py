@@ -0,0 +1,69 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+# features import these on first use, seeing one of them before the window is up is a regression
+deferred = ['skrf', 'scipy', 'pandas', 'tikzplotlib', 'openpyxl', 'IPython', 'plugin']
+
+marker = 'radiolarite-startup'
+re_importtime = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+_phases = []
+_start = time.perf_counter()
+
+
+def phase(name: str):
+    # called by main.window() in the profiled child, -X importtime lines before the last marker count
+    _phases.append((name, time.perf_counter()))
+    print("{} {} {:.1f}".format(marker, name, (time.perf_counter() - _start) * 1e3), file=sys.stderr, flush=True)
+
+
+def parse(stderr: str):
+    imports = []  # (module, self ms, cumulative ms, depth)
+    phases = []
+    for line in stderr.splitlines():
+        if line.startswith(marker):
+            _, name, ms = line.split(' ')
+            phases.append((name, float(ms), len(imports)))
+            continue
+        match = re_importtime.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            imports.append((module, int(own) / 1e3, int(cumulative) / 1e3, (len(indent) - 1) // 2))
+    return imports, phases
+
+
+def report(imports, phases, top: int = 15) -> int:
+    shown = phases[-1][2] if phases else len(imports)
+    startup = imports[:shown]
+    previous = 0.
+    for name, ms, _ in phases:
+        print("{:<12} {:8.1f} ms  (+{:.1f})".format(name, ms, ms - previous))
+        previous = ms
+    total = sum(own for _, own, _, _ in startup)
+    print("\n{} modules imported before the window was shown, {:.1f} ms".format(len(startup), total))
+    print("slowest top-level imports (cumulative ms):")
+    toplevel = sorted((i for i in startup if i[3] == 0), key=lambda i: i[2], reverse=True)
+    for module, _, cumulative, _ in toplevel[:top]:
+        print("  {:8.1f}  {}".format(cumulative, module))
+
+    loaded = sorted({module.split('.')[0] for module, _, _, _ in startup} & set(deferred))
+    if loaded:
+        print("\nimported at startup but should be deferred: " + ', '.join(loaded), file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv) -> int:
+    # re-run the GUI with -X importtime, it quits on its own once the first frame is painted
+    mainScript = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    args = [a for a in argv if a != '--profile-startup']
+    result = subprocess.run([sys.executable, '-X', 'importtime', mainScript, '--startup-child'] + args,
+                            stderr=subprocess.PIPE, text=True)
+    imports, phases = parse(result.stderr)
+    if result.returncode != 0 or not phases:
+        print(result.stderr, file=sys.stderr)
+        return result.returncode or 1
+    return report(imports, phases)
@@ -0,0 +1,184 @@
+import os
+import re
+import tempfile
+import warnings
+
+import numpy as npy
+
+CACHE_VERSION = 1
+
+frequencyUnits = {'hz': 1.0, 'khz': 1e3, 'mhz': 1e6, 'ghz': 1e9, 'thz': 1e12}
+
+re_extension = re.compile(r'\.s(\d+)p$', re.IGNORECASE)
+re_comment = re.compile(r'!.*')
+
+
+def portCount(filename: str) -> int:
+    match = re_extension.search(filename)
+    if match is None:
+        raise ValueError("Not a Touchstone file: {}".format(filename))
+    return int(match.group(1))
+
+
+def parseOptions(line: str):
+    unit, fmt, z0 = 'ghz', 'ma', 50.0  # defaults from the Touchstone 1.1 spec
+    tok = line.lower().split()
+    i = 0
+    while i < len(tok):
+        t = tok[i]
+        if t in frequencyUnits:
+            unit = t
+        elif t in ('ri', 'ma', 'db'):
+            fmt = t
+        elif t == 'r' and i + 1 < len(tok):
+            z0 = float(tok[i + 1])
+            i += 1
+        elif t != 's':  # Y/Z/H/G parameters are left to scikit-rf
+            raise ValueError("Unsupported option '{}'".format(t))
+        i += 1
+    return unit, fmt, z0
+
+
+def parseTouchstoneText(text: str, nports: int):
+    text = re_comment.sub('', text)
+    if '[' in text:
+        raise ValueError("Touchstone 2.0 keywords are not supported")
+    # cut the option line out by hand, a multiline regex over the whole body is far too slow
+    start = text.find('#')
+    if start < 0:
+        body = text
+        unit, fmt, z0 = parseOptions('')
+    else:
+        end = text.find('\n', start)
+        end = len(text) if end < 0 else end
+        unit, fmt, z0 = parseOptions(text[start + 1:end])
+        body = text[:start] + text[end:]
+
+    # line wrapping of 3- and 4-ports does not matter once everything is one flat token stream
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            data = npy.fromstring(body, dtype=float, sep=' ')
+        except DeprecationWarning:
+            raise ValueError("Malformed numeric data")
+
+    cols = 1 + 2 * nports * nports
+    if data.size == 0 or data.size % cols != 0:
+        raise ValueError("Unexpected number of values (noise parameters?)")
+    data = data.reshape(-1, cols)
+    f = data[:, 0] * frequencyUnits[unit]
+    if npy.any(npy.diff(f) <= 0):
+        raise ValueError("Frequencies are not strictly increasing")
+
+    a = data[:, 1::2]
+    b = data[:, 2::2]
+    if fmt == 'ri':
+        s = a + 1j * b
+    elif fmt == 'ma':
+        s = a * npy.exp(1j * npy.deg2rad(b))
+    else:
+        s = 10 ** (a / 20) * npy.exp(1j * npy.deg2rad(b))
+    s = s.reshape(-1, nports, nports)
+    if nports == 2:
+        s = s.transpose(0, 2, 1)  # 2-ports are stored S11 S21 S12 S22
+    return f, npy.ascontiguousarray(s), npy.full((len(f), nports), z0)
+
+
+def cachePath(filename: str) -> str:
+    head, tail = os.path.split(os.path.abspath(filename))
+    return os.path.join(head, '.{}.rlcache.npz'.format(tail))
+
+
+def cacheKey(filename: str):
+    st = os.stat(filename)
+    return os.path.abspath(filename), st.st_mtime_ns, st.st_size
+
+
+def readCache(filename: str):
+    path = cachePath(filename)
+    if not os.path.exists(path):
+        return None
+    try:
+        with npy.load(path) as cache:
+            if (int(cache['version']) != CACHE_VERSION or
+                    (str(cache['path']), int(cache['mtime']), int(cache['size'])) != cacheKey(filename)):
+                return None
+            return str(cache['name']), cache['f'], cache['s'], cache['z0']
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def writeCache(filename: str, key: tuple, name, f, s, z0):
+    # key is taken before parsing, a file that changed meanwhile is not cached under its new key
+    path = cachePath(filename)
+    tmp = None
+    try:
+        if cacheKey(filename) != key:
+            return
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))  # one per worker
+        with os.fdopen(fd, 'wb') as fh:
+            npy.savez(fh, version=CACHE_VERSION, path=key[0], mtime=key[1], size=key[2],
+                      name=name, f=f, s=s, z0=z0)
+        os.replace(tmp, path)
+    except OSError as e:  # read-only share etc., caching is best effort
+        print("could not write cache {}: {}".format(path, e))
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def readTouchstone(filename: str, useCache: bool = True):
+    if useCache:
+        cached = readCache(filename)
+        if cached is not None:
+            return cached
+
+    key = cacheKey(filename) if useCache else None
+    name = os.path.splitext(os.path.basename(filename))[0]
+    try:
+        with open(filename, 'r', encoding='utf8', errors='replace') as fh:
+            f, s, z0 = parseTouchstoneText(fh.read(), portCount(filename))
+    except ValueError as e:
+        print("fast parser failed for {} ({}), falling back to scikit-rf".format(filename, e))
+        import skrf
+        nw = skrf.Network(filename)
+        name, f, s, z0 = nw.name, nw.f, nw.s, nw.z0
+
+    if useCache:
+        writeCache(filename, key, name, f, s, z0)
+    return name, f, s, z0
+
+
+def formatPairs(s: npy.ndarray, fmt: str):
+    if fmt == 'ri':
+        return s.real, s.imag
+    elif fmt == 'ma':
+        return npy.abs(s), npy.angle(s, deg=True)
+    return 20 * npy.log10(npy.abs(s)), npy.angle(s, deg=True)
+
+
+def writeTouchstone(filename: str, f: npy.ndarray, s: npy.ndarray, z0: float = 50., fmt: str = 'ri',
+                    unit: str = 'ghz', comment: str = None, chunk: int = 65536):
+    # streams chunk by chunk, f and s can be memory-mapped
+    fmt = fmt.lower()
+    nports = s.shape[1]
+    multiplier = frequencyUnits[unit.lower()]
+    with open(filename, 'w') as fh:
+        if comment:
+            fh.write('! {}\n'.format(comment))
+        fh.write('# {} S {} R {:g}\n'.format(unit.upper(), fmt.upper(), z0))
+        for start in range(0, len(f), chunk):
+            fc = npy.asarray(f[start:start + chunk]) / multiplier
+            a, b = formatPairs(npy.asarray(s[start:start + chunk]), fmt)
+            if nports == 2:
+                a, b = a.transpose(0, 2, 1), b.transpose(0, 2, 1)  # written column-wise, S11 S21 S12 S22
+            pairs = npy.stack((a, b), axis=-1).reshape(len(fc), nports, 2 * nports)
+            if nports <= 2:
+                npy.savetxt(fh, npy.column_stack((fc, pairs.reshape(len(fc), -1))), fmt='%.12g')
+                continue
+            # 3+ ports: one matrix row per line, at most four pairs per line
+            for i in range(len(fc)):
+                lines = []
+                for row in pairs[i]:
+                    for first in range(0, len(row), 8):
+                        lines.append(' '.join('%.12g' % v for v in row[first:first + 8]))
+                fh.write('%.12g ' % fc[i] + '\n  '.join(lines) + '\n')
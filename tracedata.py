@@ -0,0 +1,88 @@
+import numpy as npy
+
+from instrumentation import span
+from networkitem import NetworkItem
+
+
+def complex_2_db(z: npy.ndarray) -> npy.ndarray:
+    return 20 * npy.log10(npy.abs(z))  # same as skrf.mathFunctions, which would pull in all of skrf
+
+
+def complex_2_degree(z: npy.ndarray) -> npy.ndarray:
+    return npy.angle(z, deg=True)
+
+
+projections = {
+    'db': (complex_2_db, 'Magnitude (dB)'),
+    'mag': (npy.abs, 'Magnitude'),
+    'deg': (complex_2_degree, 'Phase (deg)'),
+    'rad': (npy.angle, 'Phase (rad)'),
+    're': (npy.real, 'Real Part'),
+    'im': (npy.imag, 'Imaginary Part'),
+}
+
+timeModes = ['s_time', 'z_time']
+
+
+def traceLabel(name: str, m: int, n: int) -> str:
+    return "{}, S{}{}".format(name, m + 1, n + 1)
+
+
+def axisLabels(mode: str, nwItem: NetworkItem) -> tuple[str, str]:
+    if mode == 's_time':
+        return 'Time (ns)', 'Magnitude (dB)'
+    elif mode == 'z_time':
+        return 'Time (ns)', 'Z (Ohm)'
+    elif mode == 'smith':
+        return '', ''
+    elif mode in projections:
+        return 'Frequency ({})'.format(nwItem.network().frequency.unit), projections[mode][1]
+    raise Exception("Unknown representation")
+
+
+def zTimeStep(f: npy.ndarray, s: npy.ndarray, z0: float):
+    import skrf
+    nw1 = skrf.Network(s=s, f=f, f_unit='hz')
+    nw1 = nw1.extrapolate_to_dc(kind='linear')
+    t, y = nw1.step_response(window='hamming')
+    y[y == 1.] = 1. + 1e-12  # solve numerical singularity
+    y[y == -1.] = -1. + 1e-12
+    return t * 1e9, z0 * (1 + y) / (1 - y)
+
+
+def deriveTrace(nwItem: NetworkItem, mode: str, m: int, n: int, window: slice = None):
+    # x/y data of one trace in the given plot mode, the frequency window only applies to frequency modes
+    key = (mode, m, n, None if window is None else (window.start, window.stop))
+    data = nwItem.cache.get(key)
+    if data is None:
+        with span('derive', mode=mode) as s:
+            data = _derive(nwItem, mode, m, n, window)
+            s.set(points=len(data[0]))
+        nwItem.cache.put(key, data, data[0].nbytes + data[1].nbytes)
+    return data
+
+
+def _derive(nwItem: NetworkItem, mode: str, m: int, n: int, window: slice):
+    network = nwItem.network()
+    if mode == 's_time':
+        from skrf.network2 import s2time
+        return network.frequency.t_ns, complex_2_db(s2time(nwItem.sParam(m, n))[:, 0, 0])
+    elif mode == 'z_time':
+        return zTimeStep(nwItem.frequency(), npy.asarray(nwItem.sParam(m, n)), network.z0[0, m].real)
+    val = nwItem.sParam(m, n, window)
+    if mode == 'smith':
+        return npy.real(val), npy.imag(val)
+    elif mode in projections:
+        return nwItem.frequency(window) / network.frequency.multiplier, projections[mode][0](val)
+    raise Exception("Unknown representation")
+
+
+def plotTrace(ax, nwItem: NetworkItem, mode: str, m: int, n: int, window: slice = None, **kwargs):
+    x, y = deriveTrace(nwItem, mode, m, n, window)
+    lines = ax.plot(x, y, label=traceLabel(nwItem.network().name, m, n), **kwargs)
+    if mode != 'smith':
+        x_label, y_label = axisLabels(mode, nwItem)
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+        ax.autoscale(True, 'x', True)
+    return lines
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'mainwindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1024, 768)
+        MainWindow.setAcceptDrops(True)
+        MainWindow.setLocale(QtCore.QLocale(QtCore.QLocale.English, QtCore.QLocale.UnitedStates))
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.plotSelectorLabel = QtWidgets.QLabel(self.centralwidget)
+        self.plotSelectorLabel.setObjectName("plotSelectorLabel")
+        self.horizontalLayout.addWidget(self.plotSelectorLabel)
+        self.plotSelectorBox = QtWidgets.QComboBox(self.centralwidget)
+        self.plotSelectorBox.setObjectName("plotSelectorBox")
+        self.horizontalLayout.addWidget(self.plotSelectorBox)
+        self.label = QtWidgets.QLabel(self.centralwidget)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        self.startFrequencyEdit = QtWidgets.QLineEdit(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.startFrequencyEdit.sizePolicy().hasHeightForWidth())
+        self.startFrequencyEdit.setSizePolicy(sizePolicy)
+        self.startFrequencyEdit.setObjectName("startFrequencyEdit")
+        self.horizontalLayout.addWidget(self.startFrequencyEdit)
+        self.label_2 = QtWidgets.QLabel(self.centralwidget)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout.addWidget(self.label_2)
+        self.stopFrequencyEdit = QtWidgets.QLineEdit(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.stopFrequencyEdit.sizePolicy().hasHeightForWidth())
+        self.stopFrequencyEdit.setSizePolicy(sizePolicy)
+        self.stopFrequencyEdit.setObjectName("stopFrequencyEdit")
+        self.horizontalLayout.addWidget(self.stopFrequencyEdit)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setSpacing(1)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.verticalLayout.addLayout(self.horizontalLayout_2)
+        self.gridLayout_2.addLayout(self.verticalLayout, 0, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 1024, 17))
+        self.menubar.setObjectName("menubar")
+        self.menuFile = QtWidgets.QMenu(self.menubar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuPlot = QtWidgets.QMenu(self.menubar)
+        self.menuPlot.setObjectName("menuPlot")
+        self.menuShow_Grid = QtWidgets.QMenu(self.menuPlot)
+        self.menuShow_Grid.setTearOffEnabled(False)
+        self.menuShow_Grid.setObjectName("menuShow_Grid")
+        self.menuMath = QtWidgets.QMenu(self.menubar)
+        self.menuMath.setObjectName("menuMath")
+        self.menuView = QtWidgets.QMenu(self.menubar)
+        self.menuView.setObjectName("menuView")
+        MainWindow.setMenuBar(self.menubar)
+        self.actionOpenTouchstoneFile = QtWidgets.QAction(MainWindow)
+        self.actionOpenTouchstoneFile.setObjectName("actionOpenTouchstoneFile")
+        self.actionExportFigure = QtWidgets.QAction(MainWindow)
+        self.actionExportFigure.setObjectName("actionExportFigure")
+        self.actionExit = QtWidgets.QAction(MainWindow)
+        self.actionExit.setObjectName("actionExit")
+        self.actionAddSubplot = QtWidgets.QAction(MainWindow)
+        self.actionAddSubplot.setObjectName("actionAddSubplot")
+        self.actionAddMarker = QtWidgets.QAction(MainWindow)
+        self.actionAddMarker.setObjectName("actionAddMarker")
+        self.actionNew = QtWidgets.QAction(MainWindow)
+        self.actionNew.setObjectName("actionNew")
+        self.actionGridMajor = QtWidgets.QAction(MainWindow)
+        self.actionGridMajor.setCheckable(True)
+        self.actionGridMajor.setChecked(True)
+        self.actionGridMajor.setObjectName("actionGridMajor")
+        self.actionGridMinor = QtWidgets.QAction(MainWindow)
+        self.actionGridMinor.setCheckable(True)
+        self.actionGridMinor.setChecked(True)
+        self.actionGridMinor.setObjectName("actionGridMinor")
+        self.actionCopy_to_clipboard = QtWidgets.QAction(MainWindow)
+        self.actionCopy_to_clipboard.setObjectName("actionCopy_to_clipboard")
+        self.actionZeroReflection = QtWidgets.QAction(MainWindow)
+        self.actionZeroReflection.setObjectName("actionZeroReflection")
+        self.actionLegend = QtWidgets.QAction(MainWindow)
+        self.actionLegend.setObjectName("actionLegend")
+        self.actionExportCSV = QtWidgets.QAction(MainWindow)
+        self.actionExportCSV.setObjectName("actionExportCSV")
+        self.actionTikzTolerance = QtWidgets.QAction(MainWindow)
+        self.actionTikzTolerance.setObjectName("actionTikzTolerance")
+        self.actionTikzExternal = QtWidgets.QAction(MainWindow)
+        self.actionTikzExternal.setCheckable(True)
+        self.actionTikzExternal.setObjectName("actionTikzExternal")
+        self.actionOpenSession = QtWidgets.QAction(MainWindow)
+        self.actionOpenSession.setObjectName("actionOpenSession")
+        self.actionSaveSession = QtWidgets.QAction(MainWindow)
+        self.actionSaveSession.setObjectName("actionSaveSession")
+        self.actionWatchDirectory = QtWidgets.QAction(MainWindow)
+        self.actionWatchDirectory.setObjectName("actionWatchDirectory")
+        self.actionStopWatching = QtWidgets.QAction(MainWindow)
+        self.actionStopWatching.setEnabled(False)
+        self.actionStopWatching.setObjectName("actionStopWatching")
+        self.actionExportQueue = QtWidgets.QAction(MainWindow)
+        self.actionExportQueue.setObjectName("actionExportQueue")
+        self.actionMemoryMap = QtWidgets.QAction(MainWindow)
+        self.actionMemoryMap.setCheckable(True)
+        self.actionMemoryMap.setChecked(True)
+        self.actionMemoryMap.setObjectName("actionMemoryMap")
+        self.actionEnvelope = QtWidgets.QAction(MainWindow)
+        self.actionEnvelope.setCheckable(True)
+        self.actionEnvelope.setObjectName("actionEnvelope")
+        self.actionEnvelopeBand = QtWidgets.QAction(MainWindow)
+        self.actionEnvelopeBand.setObjectName("actionEnvelopeBand")
+        self.actionDataCursor = QtWidgets.QAction(MainWindow)
+        self.actionDataCursor.setCheckable(True)
+        self.actionDataCursor.setObjectName("actionDataCursor")
+        self.actionPerformance = QtWidgets.QAction(MainWindow)
+        self.actionPerformance.setCheckable(True)
+        self.actionPerformance.setObjectName("actionPerformance")
+        self.actionProfileOperation = QtWidgets.QAction(MainWindow)
+        self.actionProfileOperation.setObjectName("actionProfileOperation")
+        self.menuFile.addAction(self.actionNew)
+        self.menuFile.addAction(self.actionOpenTouchstoneFile)
+        self.menuFile.addAction(self.actionOpenSession)
+        self.menuFile.addAction(self.actionSaveSession)
+        self.menuFile.addAction(self.actionWatchDirectory)
+        self.menuFile.addAction(self.actionStopWatching)
+        self.menuFile.addAction(self.actionExportFigure)
+        self.menuFile.addAction(self.actionTikzTolerance)
+        self.menuFile.addAction(self.actionTikzExternal)
+        self.menuFile.addAction(self.actionExportCSV)
+        self.menuFile.addAction(self.actionExportQueue)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.actionMemoryMap)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.actionExit)
+        self.menuShow_Grid.addAction(self.actionGridMajor)
+        self.menuShow_Grid.addAction(self.actionGridMinor)
+        self.menuPlot.addAction(self.menuShow_Grid.menuAction())
+        self.menuPlot.addAction(self.actionCopy_to_clipboard)
+        self.menuPlot.addAction(self.actionLegend)
+        self.menuPlot.addSeparator()
+        self.menuPlot.addAction(self.actionEnvelope)
+        self.menuPlot.addAction(self.actionEnvelopeBand)
+        self.menuView.addAction(self.actionDataCursor)
+        self.menuView.addAction(self.actionPerformance)
+        self.menuView.addAction(self.actionProfileOperation)
+        self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuPlot.menuAction())
+        self.menubar.addAction(self.menuMath.menuAction())
+        self.menubar.addAction(self.menuView.menuAction())
+
+        self.retranslateUi(MainWindow)
+        self.actionExit.triggered.connect(MainWindow.close) # type: ignore
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Radiolarite"))
+        self.plotSelectorLabel.setText(_translate("MainWindow", "Plot:"))
+        self.label.setText(_translate("MainWindow", "Start:"))
+        self.startFrequencyEdit.setPlaceholderText(_translate("MainWindow", "0 GHz"))
+        self.label_2.setText(_translate("MainWindow", "Stop:"))
+        self.stopFrequencyEdit.setPlaceholderText(_translate("MainWindow", "10 GHz"))
+        self.menuFile.setTitle(_translate("MainWindow", "File"))
+        self.menuPlot.setTitle(_translate("MainWindow", "Plot"))
+        self.menuShow_Grid.setTitle(_translate("MainWindow", "Show Grid"))
+        self.menuMath.setTitle(_translate("MainWindow", "Math"))
+        self.menuView.setTitle(_translate("MainWindow", "View"))
+        self.actionOpenTouchstoneFile.setText(_translate("MainWindow", "Open"))
+        self.actionOpenTouchstoneFile.setShortcut(_translate("MainWindow", "Ctrl+O"))
+        self.actionExportFigure.setText(_translate("MainWindow", "Export Figure"))
+        self.actionExportFigure.setShortcut(_translate("MainWindow", "Ctrl+E"))
+        self.actionExit.setText(_translate("MainWindow", "Exit"))
+        self.actionExit.setShortcut(_translate("MainWindow", "Esc, Esc, Esc"))
+        self.actionAddSubplot.setText(_translate("MainWindow", "Add Subplot"))
+        self.actionAddMarker.setText(_translate("MainWindow", "Add Marker"))
+        self.actionAddMarker.setShortcut(_translate("MainWindow", "M"))
+        self.actionNew.setText(_translate("MainWindow", "New"))
+        self.actionNew.setShortcut(_translate("MainWindow", "Ctrl+N"))
+        self.actionGridMajor.setText(_translate("MainWindow", "Major"))
+        self.actionGridMinor.setText(_translate("MainWindow", "Minor"))
+        self.actionCopy_to_clipboard.setText(_translate("MainWindow", "Copy to clipboard"))
+        self.actionCopy_to_clipboard.setShortcut(_translate("MainWindow", "Ctrl+C"))
+        self.actionZeroReflection.setText(_translate("MainWindow", "Set Reflection to 0"))
+        self.actionLegend.setText(_translate("MainWindow", "Legend"))
+        self.actionExportCSV.setText(_translate("MainWindow", "Export Data..."))
+        self.actionTikzTolerance.setText(_translate("MainWindow", "TikZ Point Reduction..."))
+        self.actionTikzExternal.setText(_translate("MainWindow", "TikZ Data in External Files"))
+        self.actionOpenSession.setText(_translate("MainWindow", "Open Session..."))
+        self.actionSaveSession.setText(_translate("MainWindow", "Save Session..."))
+        self.actionWatchDirectory.setText(_translate("MainWindow", "Watch Directory..."))
+        self.actionStopWatching.setText(_translate("MainWindow", "Stop Watching"))
+        self.actionExportQueue.setText(_translate("MainWindow", "Export Queue..."))
+        self.actionMemoryMap.setText(_translate("MainWindow", "Memory-map Large Sweeps"))
+        self.actionEnvelope.setText(_translate("MainWindow", "Statistical Envelope"))
+        self.actionEnvelope.setToolTip(_translate("MainWindow", "Show the selected networks as mean, standard deviation and min/max band per parameter"))
+        self.actionEnvelopeBand.setText(_translate("MainWindow", "Envelope Band..."))
+        self.actionDataCursor.setText(_translate("MainWindow", "Data Cursor"))
+        self.actionDataCursor.setToolTip(_translate("MainWindow", "Read values off the traces, double click or press M for a marker, Esc clears the markers"))
+        self.actionPerformance.setText(_translate("MainWindow", "Performance"))
+        self.actionProfileOperation.setText(_translate("MainWindow", "Profile Next Operation..."))
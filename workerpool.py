@@ -0,0 +1,23 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_executor: ProcessPoolExecutor = None
+
+
+def workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)  # leave a core for the GUI
+
+
+def executor() -> ProcessPoolExecutor:
+    # one process pool shared by file loading and plugins, only spawned once something needs it
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers())
+    return _executor
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None